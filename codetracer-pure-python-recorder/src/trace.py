@@ -23,16 +23,37 @@ weaker test suite.
 
 See ``codetracer-pure-python-recorder/README.md`` for the full
 rationale and the practical guidance on changing the trace shape.
+
+Setting ``CODETRACER_PROFILE_ONLY`` to a non-empty value switches from
+``sys.settrace`` to ``sys.setprofile``. CPython then invokes the callback
+once per call and return instead of once per executed line, which is much
+cheaper, but the trace only contains ``Call``/``Return`` events and the
+``Step``/``Value`` events recorded on return: there are no per-line steps
+and no locals captured between calls. The default full recording is what
+the fixtures are generated from.
 """
 
 import json
 import os
 import runpy
+import site
 import sys
+import sysconfig
 import types
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import IO, Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+try:
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - orjson is an optional accelerator
+    _orjson = None
+
+# Compact separators let ``json`` use its C encoder and keep each event on
+# one line of ``trace.json``.
+_EVENT_ENCODER = json.JSONEncoder(separators=(",", ":"))
 
+# Ints in ``range(SMALL_INT_VALUES)`` have their value records prebuilt.
+SMALL_INT_VALUES = 256
 
 class StdoutInterceptor:
     """Capture writes to stdout and emit trace events."""
@@ -51,26 +72,170 @@ class StdoutInterceptor:
         self.original.flush()
 
 
+def _encode_json(obj: Any) -> bytes:
+    """Encode ``obj`` as compact UTF-8 JSON, preferring ``orjson``.
+
+    ``orjson`` rejects a few values the stdlib accepts, such as integers
+    outside the 64-bit range or strings with lone surrogates; those are
+    encoded with the stdlib.
+    """
+    if _orjson is not None:
+        try:
+            return _orjson.dumps(obj)
+        except TypeError:
+            pass
+    return _EVENT_ENCODER.encode(obj).encode()
+
+
+class EventLog:
+    """Append-only trace event log kept as encoded JSON.
+
+    Every event is encoded when it is appended and added to one growing
+    buffer, each record preceded by its ``",\\n"`` separator. ``Step``
+    events make up most of a trace and have a fixed shape, so they are
+    formatted directly instead of going through a dict and the encoder, and
+    the tracer hands over its values already encoded.
+
+    When ``fp`` is given, the buffer is written to it once it holds
+    ``flush_bytes`` bytes, so a long run does not keep its whole trace in
+    memory. ``close`` writes the rest and ends the JSON array. The file
+    holds one compact event per line, so it can be tailed or split by line
+    while staying a single legacy JSON array.
+    """
+
+    def __init__(self, fp: Optional[IO[bytes]] = None, flush_bytes: int = 1 << 20) -> None:
+        self.fp = fp
+        self.flush_bytes = flush_bytes
+        self.flushed = 0
+        self._pending = 0
+        self._buf = bytearray()
+
+    def __len__(self) -> int:
+        return self.flushed + self._pending
+
+    def append(self, event: Dict[str, Any]) -> None:
+        self.append_encoded(_encode_json(event))
+
+    def append_encoded(self, record: bytes) -> None:
+        self._buf += b",\n" + record
+        self._pending += 1
+
+    def append_step(self, path_id: int, line: int) -> None:
+        self._buf += b',\n{"Step":{"path_id":%d,"line":%d}}' % (path_id, line)
+        self._pending += 1
+        # Every traced line and return appends a step, so checking here is
+        # enough to bound the buffer without a check per append.
+        if self.fp is not None and len(self._buf) >= self.flush_bytes:
+            self.flush()
+
+    def append_value(self, variable_id: int, value: bytes) -> None:
+        self._buf += b',\n{"Value":{"variable_id":%d,"value":%b}}' % (variable_id, value)
+        self._pending += 1
+
+    def flush(self) -> None:
+        """Write the pending events to ``fp`` and drop them from memory."""
+        if self._pending:
+            with memoryview(self._buf) as pending:
+                # The first record's separator opens the array instead.
+                self.fp.write(pending if self.flushed else b"[" + pending[1:])
+            self.flushed += self._pending
+            self._pending = 0
+            self._buf = bytearray()
+
+    def close(self) -> None:
+        """Write the remaining events and end the JSON array."""
+        self.flush()
+        self.fp.write(b"\n]" if self.flushed else b"[]")
+
+    def write_json(self, fp: IO[bytes]) -> None:
+        """Write every event to ``fp`` at once, for logs created without one."""
+        self.fp = fp
+        self.close()
+
+
+def _library_prefixes(program_dir: str) -> Tuple[str, ...]:
+    """Return the stdlib and site-packages directories that are never traced.
+
+    A directory that contains the program itself is left out, so a program
+    living inside one of them is still traced.
+    """
+    paths = sysconfig.get_paths()
+    dirs = {paths[key] for key in ("stdlib", "platstdlib", "purelib", "platlib") if key in paths}
+    if hasattr(site, "getsitepackages"):  # missing from some virtualenv site.py copies
+        dirs.update(site.getsitepackages())
+    program = os.path.join(program_dir, "")
+    prefixes = {os.path.join(os.path.abspath(d), "") for d in dirs}
+    return tuple(sorted(p for p in prefixes if not program.startswith(p)))
+
+
 class Tracer:
     """Runtime tracer producing CodeTracer traces."""
 
-    def __init__(self, program: str) -> None:
+    def __init__(self, program: str, events_file: Optional[IO[bytes]] = None) -> None:
         self.program_path = os.path.abspath(program)
         self.program_dir = str(Path(self.program_path).parent)
-        self.events: List[Dict[str, Any]] = []
+        self._library_prefixes = _library_prefixes(self.program_dir)
+        self.events = EventLog(events_file)
         self.paths: List[str] = []
         self.path_map: Dict[str, int] = {}
+        # Path ids keyed by the path exactly as passed to ``_register_path``,
+        # so repeats skip the abspath/relpath normalization.
+        self._raw_path_ids: Dict[str, int] = {}
         self.var_map: Dict[str, int] = {}
+        # Variable id of each local name seen by ``_capture_locals``, or -1
+        # for the dunder names it never captures.
+        self._capture_ids: Dict[str, int] = {}
         self.functions: Dict[types.CodeType, int] = {}
         self.types: Dict[str, int] = {}
+        # A code object's file and function never change, so their ids are
+        # cached per code object. Each id is filled on first use so the
+        # ``Path``/``Function`` events keep their original order.
+        self._code_path_ids: Dict[types.CodeType, int] = {}
+        self._code_function_ids: Dict[types.CodeType, int] = {}
+        self._in_scope: Dict[types.CodeType, bool] = {}
+        self._definition_lines: Dict[types.CodeType, FrozenSet[int]] = {}
+        # Value encoder per concrete type, filled by ``_value`` on first use.
+        self._value_handlers: Dict[type, Callable[[Any], bytes]] = {}
         self.stdout = StdoutInterceptor(self)
         self._register_builtin_types()
+        # Values are encoded straight to JSON bytes. The built-in type ids
+        # are fixed by now, so they are baked into the templates, and the
+        # values that are frequent and always encode the same are prebuilt.
+        bool_type_id = self.types["Bool"]
+        self._true_value = b'{"kind":"Bool","type_id":%d,"b":true}' % bool_type_id
+        self._false_value = b'{"kind":"Bool","type_id":%d,"b":false}' % bool_type_id
+        self._none_value_json = b'{"kind":"None","type_id":%d}' % self.types["No type"]
+        self._int_value_format = b'{"kind":"Int","type_id":%d,"i":%%d}' % self.types["Integer"]
+        self._str_value_format = b'{"kind":"String","type_id":%d,"text":%%b}' % self.types["String"]
+        self._empty_str_value = self._str_value_format % b'""'
+        self._small_int_values = tuple(self._int_value_format % i for i in range(SMALL_INT_VALUES))
         # top level
         self._register_path("")
         self._register_function("", 1, "<top-level>")
         self.emit({"Call": {"function_id": 0, "args": []}})
 
     # ------------------------------------------------------------------ utils
+    def in_scope(self, code: types.CodeType) -> bool:
+        """Return whether ``code`` comes from a file under the program's directory.
+
+        Files in the interpreter's stdlib and site-packages directories are
+        out of scope even when those directories sit under the program's,
+        e.g. a virtualenv created next to the program. So is code without a
+        real file, such as frozen stdlib modules (``<frozen os>``), whose
+        pseudo-filename would otherwise resolve against the working
+        directory.
+        """
+        in_scope = self._in_scope.get(code)
+        if in_scope is None:
+            filename = os.path.abspath(code.co_filename)
+            in_scope = (
+                not code.co_filename.startswith("<")
+                and filename.startswith(self.program_dir)
+                and not filename.startswith(self._library_prefixes)
+            )
+            self._in_scope[code] = in_scope
+        return in_scope
+
     def emit(self, event: Dict[str, Any]) -> None:
         self.events.append(event)
 
@@ -93,6 +258,10 @@ class Tracer:
     def _register_path(self, path: str) -> int:
         """Register a source file path and emit a ``Path`` event."""
 
+        path_id = self._raw_path_ids.get(path)
+        if path_id is not None:
+            return path_id
+        raw_path = path
         if path:
             abs_path = os.path.abspath(path)
             try:
@@ -104,7 +273,15 @@ class Tracer:
             self.path_map[path] = len(self.paths)
             self.paths.append(path)
             self.emit({"Path": path})
-        return self.path_map[path]
+        path_id = self._raw_path_ids[raw_path] = self.path_map[path]
+        return path_id
+
+    def _code_path_id(self, code: types.CodeType) -> int:
+        path_id = self._code_path_ids.get(code)
+        if path_id is None:
+            path_id = self._register_path(os.path.abspath(code.co_filename))
+            self._code_path_ids[code] = path_id
+        return path_id
 
     # ---------------------------------------------------------------- functions
     def _register_function(self, path: str, line: int, name: str) -> int:
@@ -115,6 +292,24 @@ class Tracer:
             self.emit({"Function": {"path_id": self._register_path(path), "line": line, "name": name}})
         return self.functions[key]
 
+    def _code_function_id(self, code: types.CodeType) -> int:
+        func_id = self._code_function_ids.get(code)
+        if func_id is None:
+            filename = os.path.abspath(code.co_filename)
+            func_id = self._register_function(filename, code.co_firstlineno, code.co_name)
+            self._code_function_ids[code] = func_id
+        return func_id
+
+    def _code_definition_lines(self, code: types.CodeType) -> FrozenSet[int]:
+        """Return the first lines of the functions defined inside ``code``."""
+        lines = self._definition_lines.get(code)
+        if lines is None:
+            lines = frozenset(
+                const.co_firstlineno for const in code.co_consts if isinstance(const, types.CodeType)
+            )
+            self._definition_lines[code] = lines
+        return lines
+
     def _register_functions_in_locals(self, frame: types.FrameType) -> None:
         for name, val in frame.f_locals.items():
             if isinstance(val, types.FunctionType):
@@ -125,19 +320,29 @@ class Tracer:
 
     # -------------------------------------------------------------- variables
     def _var_id(self, name: str) -> int:
-        if name not in self.var_map:
-            self.var_map[name] = len(self.var_map)
+        vid = self.var_map.get(name)
+        if vid is None:
+            vid = self.var_map[name] = len(self.var_map)
             self.emit({"VariableName": name})
-        return self.var_map[name]
+        return vid
 
     def _capture_locals(self, frame: types.FrameType) -> None:
+        # Runs for every local on every line, so each name's filter result
+        # and variable id are resolved once and cached in ``_capture_ids``.
+        capture_ids = self._capture_ids
+        append_value = self.events.append_value
         for name, val in frame.f_locals.items():
-            if name.startswith("__"):
+            vid = capture_ids.get(name)
+            if vid is None:
+                if name.startswith("__"):
+                    capture_ids[name] = -1
+                    continue
+                if isinstance(val, types.FunctionType):
+                    continue
+                vid = capture_ids[name] = self._var_id(name)
+            elif vid < 0 or isinstance(val, types.FunctionType):
                 continue
-            if isinstance(val, types.FunctionType):
-                continue
-            vid = self._var_id(name)
-            self.emit({"Value": {"variable_id": vid, "value": self._value(val)}})
+            append_value(vid, self._value(val))
 
     # ----------------------------------------------------------------- values
     def _ensure_type(self, kind: int, name: str) -> int:
@@ -145,78 +350,109 @@ class Tracer:
             return self._register_type(kind, name)
         return self.types[name]
 
-    def _value(self, val: Any) -> Dict[str, Any]:
+    def _value(self, val: Any) -> bytes:
+        """Return ``val`` encoded as a JSON value record."""
+        handler = self._value_handlers.get(type(val))
+        if handler is None:
+            handler = self._value_handlers[type(val)] = self._value_handler_for(val)
+        return handler(val)
+
+    def _value_handler_for(self, val: Any) -> Callable[[Any], bytes]:
+        """Pick the encoder for ``val``; ``_value`` caches it per type."""
         # Check bool BEFORE int because Python's bool is a subclass of int,
         # so isinstance(True, int) returns True. Without this order,
         # booleans are serialised as {"kind": "Int", "i": true} which
         # fails Rust serde deserialisation (expects i64, not a JSON bool).
         if isinstance(val, bool):
-            return {"kind": "Bool", "type_id": self.types["Bool"], "b": val}
+            return self._bool_value
         if isinstance(val, int):
-            return {"kind": "Int", "type_id": self.types["Integer"], "i": val}
+            return self._int_value
         if isinstance(val, str):
-            return {"kind": "String", "type_id": self.types["String"], "text": val}
+            return self._str_value
         if isinstance(val, list):
-            type_id = self._ensure_type(0, "Array")
-            return {
-                "kind": "Sequence",
-                "type_id": type_id,
-                "elements": [self._value(v) for v in val],
-                "is_slice": False,
-            }
+            return self._list_value
         if val is None:
-            return {"kind": "None", "type_id": self.types["No type"]}
+            return self._none_value
+        return self._object_value
+
+    def _bool_value(self, val: bool) -> bytes:
+        return self._true_value if val else self._false_value
+
+    def _int_value(self, val: int) -> bytes:
+        if 0 <= val < SMALL_INT_VALUES:
+            return self._small_int_values[val]
+        return self._int_value_format % val
+
+    def _str_value(self, val: str) -> bytes:
+        if not val:
+            return self._empty_str_value
+        return self._str_value_format % _encode_json(val)
+
+    def _list_value(self, val: List[Any]) -> bytes:
+        type_id = self._ensure_type(0, "Array")
+        value = self._value
+        return b'{"kind":"Sequence","type_id":%d,"elements":[%b],"is_slice":false}' % (
+            type_id,
+            b",".join([value(v) for v in val]),
+        )
+
+    def _none_value(self, val: None) -> bytes:
+        return self._none_value_json
+
+    def _object_value(self, val: Any) -> bytes:
         type_id = self._ensure_type(16, "Object")
         try:
             r = str(val)
         except Exception:
             r = f"<repr failed: {type(val).__name__}>"
-        return {"kind": "Raw", "type_id": type_id, "r": r}
+        return b'{"kind":"Raw","type_id":%d,"r":%b}' % (type_id, _encode_json(r))
 
     # --------------------------------------------------------------- callbacks
     def handle_line(self, frame: types.FrameType) -> None:
-        path = os.path.abspath(frame.f_code.co_filename)
-        path_id = self._register_path(path)
-        self.emit({"Step": {"path_id": path_id, "line": frame.f_lineno}})
-        self._register_functions_in_locals(frame)
+        path_id = self._code_path_id(frame.f_code)
+        self.events.append_step(path_id, frame.f_lineno)
+        # Scanning the locals for functions is only worth it on a line where
+        # this code defines one, which is rare compared to other lines.
+        if frame.f_lineno in self._code_definition_lines(frame.f_code):
+            self._register_functions_in_locals(frame)
         self._capture_locals(frame)
 
     def handle_call(self, frame: types.FrameType) -> None:
         code = frame.f_code
-        filename = os.path.abspath(code.co_filename)
-        func_id = self._register_function(filename, code.co_firstlineno, code.co_name)
-        args: List[Dict[str, Any]] = []
+        func_id = self._code_function_id(code)
+        args: List[bytes] = []
+        # Each ``f_locals`` access re-syncs the frame's locals, so fetch once.
+        local_vars = frame.f_locals
         for name in code.co_varnames[: code.co_argcount]:
-            if name in frame.f_locals:
+            if name in local_vars:
                 vid = self._var_id(name)
-                args.append({"variable_id": vid, "value": self._value(frame.f_locals[name])})
-        self.emit({"Call": {"function_id": func_id, "args": args}})
+                args.append(b'{"variable_id":%d,"value":%b}' % (vid, self._value(local_vars[name])))
+        self.events.append_encoded(
+            b'{"Call":{"function_id":%d,"args":[%b]}}' % (func_id, b",".join(args))
+        )
 
     def handle_return(self, frame: types.FrameType, arg: Any) -> None:
-        path = os.path.abspath(frame.f_code.co_filename)
-        path_id = self._register_path(path)
-        self.emit({"Step": {"path_id": path_id, "line": frame.f_lineno}})
+        path_id = self._code_path_id(frame.f_code)
+        self.events.append_step(path_id, frame.f_lineno)
         self._capture_locals(frame)
         vid = self._var_id("<return_value>")
         value = self._value(arg)
-        self.emit({"Value": {"variable_id": vid, "value": value}})
-        self.emit({"Return": {"return_value": value}})
+        self.events.append_value(vid, value)
+        self.events.append_encoded(b'{"Return":{"return_value":%b}}' % value)
 
 
-def trace_program(program: str) -> Tracer:
-    tracer = Tracer(program)
+def trace_program(program: str, events_file: Optional[IO[bytes]] = None) -> Tracer:
+    tracer = Tracer(program, events_file)
 
     def global_trace(frame: types.FrameType, event: str, arg: Any):
-        filename = os.path.abspath(frame.f_code.co_filename)
-        if not filename.startswith(tracer.program_dir):
+        if not tracer.in_scope(frame.f_code):
             return
         if event == "call":
             tracer.handle_call(frame)
             return local_trace
 
     def local_trace(frame: types.FrameType, event: str, arg: Any):
-        filename = os.path.abspath(frame.f_code.co_filename)
-        if not filename.startswith(tracer.program_dir):
+        if not tracer.in_scope(frame.f_code):
             return
         if event == "line":
             tracer.handle_line(frame)
@@ -227,11 +463,26 @@ def trace_program(program: str) -> Tracer:
             tracer.handle_return(frame, arg)
         return local_trace
 
-    sys.settrace(global_trace)
+    def profile_trace(frame: types.FrameType, event: str, arg: Any) -> None:
+        if not tracer.in_scope(frame.f_code):
+            return
+        if event == "call":
+            tracer.handle_call(frame)
+        elif event == "return":
+            tracer.handle_return(frame, arg)
+
+    if os.environ.get("CODETRACER_PROFILE_ONLY"):
+        install = sys.setprofile
+        install(profile_trace)
+    else:
+        install = sys.settrace
+        install(global_trace)
     sys.stdout = tracer.stdout
-    runpy.run_path(os.path.abspath(program), run_name="__main__")
-    sys.settrace(None)
-    sys.stdout = tracer.stdout.original
+    try:
+        runpy.run_path(os.path.abspath(program), run_name="__main__")
+    finally:
+        install(None)
+        sys.stdout = tracer.stdout.original
     return tracer
 
 
@@ -242,15 +493,26 @@ def main(argv: List[str] | None = None) -> None:
         raise SystemExit("Usage: codetracer-record <program.py>")
 
     program_path = argv[0]
-    tracer = trace_program(program_path)
+    # Events are streamed into a scratch file next to trace.json while the
+    # program runs and only moved into place once the array is closed, so a
+    # program that raises or exits never leaves a truncated trace behind.
+    trace_path = os.path.abspath("trace.json")
+    partial_path = trace_path + ".part"
+    f = open(partial_path, "wb")
+    try:
+        with f:
+            tracer = trace_program(program_path, f)
+            tracer.events.close()
+    except BaseException:
+        os.remove(partial_path)
+        raise
+    os.replace(partial_path, trace_path)
 
     meta = {"workdir": os.getcwd(), "program": sys.argv[0], "args": argv}
     with open("trace_metadata.json", "w") as f:
         json.dump(meta, f, indent=2)
     with open("trace_paths.json", "w") as f:
         json.dump(tracer.paths, f, indent=2)
-    with open("trace.json", "w") as f:
-        json.dump(tracer.events, f, indent=2)
 
 
 if __name__ == "__main__":  # pragma: no cover - CLI passthrough
@@ -1,4 +1,5 @@
 import json
+import os
 import subprocess
 import sys
 import tempfile
@@ -34,6 +35,63 @@ class TraceTests(unittest.TestCase):
                         expected_data = json.load(f)
                     self.assertEqual(trace_data, expected_data)
 
+    def test_profile_only_mode_skips_line_steps(self):
+        env = dict(os.environ, CODETRACER_PROFILE_ONLY="1")
+        for program in sorted(PROGRAMS_DIR.glob("*.py")):
+            with self.subTest(program=program.name):
+                with tempfile.TemporaryDirectory() as tmpdir:
+                    subprocess.run(
+                        [sys.executable, str(TRACE_SCRIPT), str(program)],
+                        cwd=tmpdir,
+                        env=env,
+                        check=True,
+                    )
+                    with open(Path(tmpdir) / "trace.json") as f:
+                        trace_data = json.load(f)
+                    with open(FIXTURES_DIR / f"{program.stem}.json") as f:
+                        expected_data = json.load(f)
+
+                    flow = [e for e in trace_data if {"Step", "Call", "Return"} & e.keys()]
+                    calls = [e for e in flow if "Call" in e]
+                    returns = [e for e in flow if "Return" in e]
+                    steps = [e for e in flow if "Step" in e]
+                    # The only steps are the ones recorded right before a
+                    # return; per-line steps need the settrace hook.
+                    for index, event in enumerate(flow):
+                        if "Step" in event:
+                            self.assertIn("Return", flow[index + 1])
+                    self.assertEqual(len(steps), len(returns))
+                    # The synthetic top-level call never returns.
+                    self.assertEqual(len(calls), len(returns) + 1)
+                    self.assertEqual(
+                        [e for e in trace_data if {"Call", "Return"} & e.keys()],
+                        [e for e in expected_data if {"Call", "Return"} & e.keys()],
+                    )
+
+    def _assert_failed_run_keeps_previous_trace(self, source):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            program = Path(tmpdir) / "program" / "failing.py"
+            program.parent.mkdir()
+            program.write_text(source)
+            trace_file = Path(tmpdir) / "trace.json"
+            trace_file.write_text("[]")
+            result = subprocess.run(
+                [sys.executable, str(TRACE_SCRIPT), str(program)],
+                cwd=tmpdir,
+                capture_output=True,
+            )
+            self.assertNotEqual(result.returncode, 0)
+            self.assertEqual(trace_file.read_text(), "[]")
+            self.assertFalse((Path(tmpdir) / "trace.json.part").exists())
+
+    def test_raising_program_keeps_previous_trace(self):
+        self._assert_failed_run_keeps_previous_trace(
+            "def boom():\n    raise RuntimeError('boom')\n\nboom()\n"
+        )
+
+    def test_exiting_program_keeps_previous_trace(self):
+        self._assert_failed_run_keeps_previous_trace("import sys\n\nsys.exit(1)\n")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -37,6 +37,10 @@ def auto_start_from_env() -> None:
 
     The output format is hard-pinned to CTFS per the CTFS-only contract;
     no ``CODETRACER_FORMAT`` lookup occurs.
+
+    This runs when the package is imported because starting on import is
+    the documented library-mode contract. When ``CODETRACER_TRACE`` is
+    unset the cost is a single ``os.getenv`` call.
     """
     path = os.getenv(ENV_TRACE_PATH)
     if not path:
@@ -45,10 +49,10 @@ def auto_start_from_env() -> None:
 
     # Delay import to avoid boot-time circular dependencies.
     from . import session
-    from .codetracer_python_recorder import configure_policy_from_env as _configure_policy_from_env
-
-    _configure_policy_from_env()
 
+    # ``session.start`` refreshes policy from the environment itself
+    # (``apply_env_policy`` defaults to ``True``), so there is no separate
+    # ``configure_policy_from_env`` round trip through the backend here.
     if session.is_tracing():
         log.debug("codetracer auto-start skipped: tracing already active")
         return
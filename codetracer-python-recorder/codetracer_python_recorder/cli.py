@@ -8,14 +8,14 @@ to convert recorded CTFS traces to JSON or other human-readable forms.
 from __future__ import annotations
 
 import argparse
+import contextlib
 import json
 import os
 import runpy
 import sys
 from dataclasses import dataclass
-from importlib import metadata
 from pathlib import Path
-from typing import Iterable, Sequence
+from typing import Iterable, Iterator, Sequence
 
 from . import flush, policy_snapshot, start, stop
 from .auto_start import ENV_TRACE_FILTER
@@ -120,6 +120,28 @@ def _help_epilog() -> str:
     )
 
 
+class _LazyVersionAction(argparse.Action):
+    """``--version`` action that resolves the package version only when used.
+
+    ``importlib.metadata`` scans every installed distribution to find ours,
+    which costs tens of milliseconds. Building the version string eagerly
+    charged that to every recorded run, not just ``--version`` calls.
+    """
+
+    def __init__(self, option_strings: Sequence[str], dest: str, **kwargs: object) -> None:
+        super().__init__(
+            option_strings,
+            dest=argparse.SUPPRESS,
+            default=argparse.SUPPRESS,
+            nargs=0,
+            help="show program's version number and exit",
+        )
+
+    def __call__(self, parser, namespace, values, option_string=None) -> None:
+        sys.stdout.write(f"codetracer-python-recorder {_resolve_package_version() or 'dev'}\n")
+        parser.exit()
+
+
 def _parse_args(argv: Sequence[str]) -> RecorderCLIConfig:
     parser = argparse.ArgumentParser(
         prog="codetracer-python-recorder",
@@ -135,8 +157,7 @@ def _parse_args(argv: Sequence[str]) -> RecorderCLIConfig:
     parser.add_argument(
         "--version",
         "-V",
-        action="version",
-        version=f"codetracer-python-recorder {_resolve_package_version() or 'dev'}",
+        action=_LazyVersionAction,
     )
     parser.add_argument(
         "--out-dir",
@@ -431,6 +452,10 @@ def _parse_args(argv: Sequence[str]) -> RecorderCLIConfig:
 
 
 def _resolve_package_version() -> str | None:
+    # Imported lazily: ``importlib.metadata`` pulls in ``email`` and friends,
+    # which script runs that never print a version should not pay for.
+    from importlib import metadata
+
     try:
         return metadata.version("codetracer-python-recorder")
     except metadata.PackageNotFoundError:  # pragma: no cover - dev checkout
@@ -477,6 +502,34 @@ def _serialise_metadata(
     metadata_path.write_text(json.dumps(payload), encoding="utf-8")
 
 
+@contextlib.contextmanager
+def _patched_argv(argv: list[str] | None) -> Iterator[None]:
+    """Swap ``sys.argv`` for ``argv`` while the block runs.
+
+    ``None`` leaves ``sys.argv`` untouched.
+    """
+    if argv is None:
+        yield
+        return
+    old_argv = sys.argv
+    sys.argv = argv
+    try:
+        yield
+    finally:
+        sys.argv = old_argv
+
+
+def _target_argv(config: RecorderCLIConfig) -> list[str] | None:
+    """Return the ``sys.argv`` the target script or test runner should see."""
+    if config.script:
+        return [str(config.script), *config.script_args]
+    if config.pytest_args is not None:
+        return ["pytest", *config.pytest_args]
+    if config.unittest_args is not None:
+        return ["unittest", *config.unittest_args]
+    return None
+
+
 def _run_pytest(pytest_args: list[str]) -> int:
     """Run pytest with the given arguments and return its exit code."""
     try:
@@ -495,16 +548,13 @@ def _run_unittest(unittest_args: list[str]) -> int:
     import unittest
 
     # unittest.main() expects args in sys.argv format
-    old_argv = sys.argv
-    sys.argv = ["unittest"] + unittest_args
-    try:
-        # Use exit=False to prevent SystemExit and get proper return
-        program = unittest.main(module=None, exit=False)
-        return 0 if program.result.wasSuccessful() else 1
-    except SystemExit as e:
-        return e.code if isinstance(e.code, int) else 1
-    finally:
-        sys.argv = old_argv
+    with _patched_argv(["unittest", *unittest_args]):
+        try:
+            # Use exit=False to prevent SystemExit and get proper return
+            program = unittest.main(module=None, exit=False)
+            return 0 if program.result.wasSuccessful() else 1
+        except SystemExit as e:
+            return e.code if isinstance(e.code, int) else 1
 
 
 def _run_target_without_recording(config: RecorderCLIConfig) -> int:
@@ -518,14 +568,7 @@ def _run_target_without_recording(config: RecorderCLIConfig) -> int:
         f"codetracer-python-recorder: recording disabled via {ENV_DISABLED}; "
         "running target without trace capture.\n"
     )
-    old_argv = sys.argv
-    if config.script:
-        sys.argv = [str(config.script)] + config.script_args
-    elif config.pytest_args is not None:
-        sys.argv = ["pytest"] + config.pytest_args
-    elif config.unittest_args is not None:
-        sys.argv = ["unittest"] + config.unittest_args
-    try:
+    with _patched_argv(_target_argv(config)):
         if config.pytest_args is not None:
             return _run_pytest(config.pytest_args)
         if config.unittest_args is not None:
@@ -538,8 +581,6 @@ def _run_target_without_recording(config: RecorderCLIConfig) -> int:
             return 0
         sys.stderr.write("No execution mode specified\n")
         return 1
-    finally:
-        sys.argv = old_argv
 
 
 def main(argv: Iterable[str] | None = None) -> int:
@@ -598,35 +639,26 @@ def main(argv: Iterable[str] | None = None) -> int:
     elif config.unittest_args is not None:
         test_framework = "unittest"
 
-    # Set up sys.argv for the execution
-    old_argv = sys.argv
-    if config.script:
-        sys.argv = [str(config.script)] + config.script_args
-    elif config.pytest_args is not None:
-        sys.argv = ["pytest"] + config.pytest_args
-    elif config.unittest_args is not None:
-        sys.argv = ["unittest"] + config.unittest_args
-
-    try:
-        start(
-            trace_dir,
-            format=config.format,
-            start_on_enter=config.activation_path,
-            trace_filter=filter_specs or None,
-            policy=policy_overrides,
-            test_framework=test_framework if not config.no_framework_filters else None,
-        )
-    except Exception as exc:
-        sys.stderr.write(f"Failed to start Codetracer session: {exc}\n")
-        sys.argv = old_argv
-        return 1
+    # The target sees its own argv; the original is restored after stop().
+    with _patched_argv(_target_argv(config)):
+        try:
+            start(
+                trace_dir,
+                format=config.format,
+                start_on_enter=config.activation_path,
+                trace_filter=filter_specs or None,
+                policy=policy_overrides,
+                test_framework=test_framework if not config.no_framework_filters else None,
+            )
+        except Exception as exc:
+            sys.stderr.write(f"Failed to start Codetracer session: {exc}\n")
+            return 1
 
-    snapshot = policy_snapshot()
-    propagate_script_exit = bool(snapshot.get("propagate_script_exit"))
+        snapshot = policy_snapshot()
+        propagate_script_exit = bool(snapshot.get("propagate_script_exit"))
 
-    exit_code: int | None = None
-    recorder_failed = False
-    try:
+        exit_code: int | None = None
+        recorder_failed = False
         try:
             # Execute based on mode
             if config.pytest_args is not None:
@@ -642,20 +674,18 @@ def main(argv: Iterable[str] | None = None) -> int:
                 exit_code = 1
         except SystemExit as exc:
             exit_code = exc.code if isinstance(exc.code, int) else 1
-    finally:
-        try:
-            flush()
-        except Exception as exc:
-            recorder_failed = True
-            sys.stderr.write(f"Failed to flush Codetracer session: {exc}\n")
         finally:
             try:
-                stop(exit_code=exit_code)
+                flush()
             except Exception as exc:
                 recorder_failed = True
-                sys.stderr.write(f"Failed to stop Codetracer session: {exc}\n")
+                sys.stderr.write(f"Failed to flush Codetracer session: {exc}\n")
             finally:
-                sys.argv = old_argv
+                try:
+                    stop(exit_code=exit_code)
+                except Exception as exc:
+                    recorder_failed = True
+                    sys.stderr.write(f"Failed to stop Codetracer session: {exc}\n")
 
     _serialise_metadata(trace_dir, script=config.script, test_framework=test_framework)
 
@@ -7,6 +7,7 @@ from __future__ import annotations
 
 import contextlib
 import os
+import stat
 from collections.abc import Sequence
 from pathlib import Path
 from typing import Iterator, Mapping, Optional
@@ -32,6 +33,8 @@ class TraceSession:
     :meth:`flush` and :meth:`stop` to interact with the global session.
     """
 
+    __slots__ = ("path", "format")
+
     path: Path
     format: str
 
@@ -120,7 +123,7 @@ def start(
     if _is_tracing_backend():
         raise RuntimeError("tracing already active")
 
-    trace_path = _validate_trace_path(Path(path))
+    trace_path = _validate_trace_path(path if isinstance(path, Path) else Path(path))
     normalized_format = _coerce_format(format)
     activation_path = _normalize_activation_path(start_on_enter)
     filter_chain = _normalize_trace_filter(trace_filter)
@@ -145,7 +148,9 @@ def stop(*, exit_code: int | None = None) -> None:
         Optional process exit status to forward to the backend.
     """
     global _active_session
-    if not _is_tracing_backend():
+    # ``_active_session`` mirrors the backend state for sessions started
+    # through :func:`start`; only ask the backend when no handle is known.
+    if _active_session is None and not _is_tracing_backend():
         return
     trace_path = _active_session.path if _active_session is not None else None
     _stop_backend(exit_code)
@@ -160,8 +165,13 @@ def is_tracing() -> bool:
 
 
 def flush() -> None:
-    """Flush buffered trace data."""
-    if _is_tracing_backend():
+    """Flush buffered trace data.
+
+    The guard reads the Python-side session handle instead of crossing the
+    FFI boundary, so callers can flush between batches cheaply. Sessions
+    started directly through the backend bindings are not flushed here.
+    """
+    if _active_session is not None:
         _flush_backend()
 
 
@@ -204,7 +214,14 @@ def _coerce_format(value: str) -> str:
 
 def _validate_trace_path(path: Path) -> Path:
     path = path.expanduser()
-    if path.exists() and not path.is_dir():
+    # One ``stat`` instead of ``exists()`` followed by ``is_dir()``. Paths
+    # that cannot be stat'ed are left for the backend to report when it
+    # creates the directory.
+    try:
+        mode = path.stat().st_mode
+    except OSError:
+        return path
+    if not stat.S_ISDIR(mode):
         raise ValueError("trace path exists and is not a directory")
     return path
 
@@ -212,7 +229,13 @@ def _validate_trace_path(path: Path) -> Path:
 def _normalize_activation_path(value: str | Path | None) -> str | None:
     if value is None:
         return None
-    return str(Path(value).expanduser())
+    raw = os.fspath(value)
+    # Only ``~`` (and the empty string, which ``Path`` turns into ``.``)
+    # needs rewriting; the backend compares activation paths component-wise,
+    # so other strings are forwarded without a ``Path`` round trip.
+    if raw and not raw.startswith("~"):
+        return raw
+    return str(Path(raw).expanduser())
 
 
 def _normalize_trace_filter(
@@ -10,16 +10,36 @@ CLI helper script as well as unit tests.
 from __future__ import annotations
 
 import json
+import mmap
+import os
+from collections.abc import Mapping
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Iterable, Mapping, Sequence
+from typing import Any, BinaryIO, Iterable, Iterator, Sequence
+
+try:
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - orjson is an optional accelerator
+    _orjson = None
+
+try:
+    import ijson as _ijson
+except ImportError:  # pragma: no cover - ijson is an optional accelerator
+    _ijson = None
+
+try:
+    from .codetracer_python_recorder import summarize_trace_file as _summarize_trace_file
+except ImportError:  # pragma: no cover - extension not built (e.g. source checkouts)
+    _summarize_trace_file = None
+
+_JSON_WHITESPACE = b" \t\r\n"
 
 
 class TraceBalanceError(RuntimeError):
     """Raised when the trace file is malformed or cannot be processed."""
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TraceBalanceResult:
     """Summary information about call/return balance within a trace."""
 
@@ -38,56 +58,180 @@ class TraceBalanceResult:
         return self.call_count - self.return_count
 
 
-def load_trace_events(trace_path: Path) -> Sequence[Mapping[str, Any]]:
-    """Load and validate the JSON event stream from ``trace.json``."""
+def _parse_json(raw: bytes | memoryview) -> Any:
+    """Decode a UTF-8 JSON document, preferring ``orjson`` when installed.
+
+    ``orjson`` parses bytes-like objects directly, so the trace never has to
+    be decoded into an intermediate ``str``. Both ``orjson.JSONDecodeError``
+    and ``json.JSONDecodeError`` subclass :class:`ValueError`.
+    """
+    if _orjson is not None:
+        return _orjson.loads(raw)
+    return json.loads(str(raw, "utf-8"))
+
+
+def _parse_json_file(trace_path: Path) -> Any:
+    """Parse ``trace_path`` through a read-only memory map.
+
+    The parser reads straight from the page cache instead of from a second
+    in-memory copy of the file. Files that cannot be mapped (empty files,
+    pipes) are read normally.
+    """
+    with trace_path.open("rb") as handle:
+        try:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return _parse_json(handle.read())
+        with mapped, memoryview(mapped) as view:
+            return _parse_json(view)
+
+
+def _not_an_object(index: int, event: object) -> TraceBalanceError:
+    return TraceBalanceError(f"event #{index} is not a JSON object (found {type(event).__name__})")
+
+
+def load_trace_events(trace_path: Path, *, validate: bool = True) -> Sequence[Mapping[str, Any]]:
+    """Load the JSON event stream from ``trace.json``.
+
+    The root must be an array, and by default every event must be an object.
+    That check costs a full extra pass, so trusted callers can skip it with
+    ``validate=False``; :func:`summarize_trace_balance` performs the same
+    check during its own scan.
+    """
     try:
-        raw_text = trace_path.read_text(encoding="utf-8")
+        data = _parse_json_file(trace_path)
     except FileNotFoundError as exc:
         raise TraceBalanceError(f"trace file not found: {trace_path}") from exc
     except OSError as exc:  # pragma: no cover - surfaced in tests via mocked IO
         raise TraceBalanceError(f"unable to read trace file: {trace_path}") from exc
-
-    try:
-        data = json.loads(raw_text)
-    except json.JSONDecodeError as exc:
+    except ValueError as exc:
         raise TraceBalanceError(f"invalid JSON in trace file: {trace_path}: {exc}") from exc
 
     if not isinstance(data, list):
         raise TraceBalanceError(f"trace root must be a JSON array, got {type(data).__name__}")
 
-    for index, event in enumerate(data):
-        if not isinstance(event, dict):
-            raise TraceBalanceError(
-                f"event #{index} is not a JSON object (found {type(event).__name__})"
-            )
+    if validate:
+        for index, event in enumerate(data):
+            if not isinstance(event, dict):
+                raise _not_an_object(index, event)
 
     return data
 
 
-def summarize_trace_balance(events: Iterable[Mapping[str, Any]]) -> TraceBalanceResult:
-    """Return a balance summary for the provided event sequence."""
+def iter_trace_events(trace_path: Path) -> Iterator[Mapping[str, Any]]:
+    """Yield the events of ``trace.json`` one at a time.
+
+    When ``ijson`` is installed the file is parsed incrementally, so peak
+    memory stays flat regardless of trace size. Without it this falls back
+    to :func:`load_trace_events`. Either way the stream can be passed
+    straight to :func:`summarize_trace_balance`, which only needs a single
+    forward pass.
+    """
+    if _ijson is None:
+        yield from load_trace_events(trace_path)
+        return
+
+    try:
+        handle = trace_path.open("rb")
+    except FileNotFoundError as exc:
+        raise TraceBalanceError(f"trace file not found: {trace_path}") from exc
+    except OSError as exc:  # pragma: no cover - surfaced in tests via mocked IO
+        raise TraceBalanceError(f"unable to read trace file: {trace_path}") from exc
+
+    with handle:
+        _ensure_array_root(handle, trace_path)
+        try:
+            for index, event in enumerate(_ijson.items(handle, "item")):
+                if not isinstance(event, dict):
+                    raise _not_an_object(index, event)
+                yield event
+        except _ijson.JSONError as exc:
+            raise TraceBalanceError(f"invalid JSON in trace file: {trace_path}: {exc}") from exc
+
+
+def _ensure_array_root(handle: BinaryIO, trace_path: Path) -> None:
+    """Reject documents whose root is not an array, then rewind ``handle``.
+
+    ``ijson.items(..., "item")`` silently yields nothing for any other root,
+    which would make a malformed trace look balanced.
+    """
+    while True:
+        chunk = handle.read(4096)
+        if not chunk:
+            raise TraceBalanceError(f"invalid JSON in trace file: {trace_path}: empty document")
+        stripped = chunk.lstrip(_JSON_WHITESPACE)
+        if stripped:
+            break
+    if not stripped.startswith(b"["):
+        raise TraceBalanceError("trace root must be a JSON array")
+    handle.seek(0)
+
+
+def summarize_trace_balance(
+    events: Iterable[Mapping[str, Any]], *, early_exit: bool = False
+) -> TraceBalanceResult:
+    """Return a balance summary for the provided event sequence.
+
+    ``events`` may be any iterable, including the lazy stream produced by
+    :func:`iter_trace_events`; it is consumed exactly once.
+
+    With ``early_exit=True`` the scan stops at the first unmatched return,
+    since the trace can no longer be balanced from that point. The counts
+    in the result then only cover the events seen so far, and the rest of
+    ``events`` is left unconsumed (and unvalidated).
+    """
     calls = 0
     returns = 0
-    active_calls = 0
     first_negative_index: int | None = None
 
+    # The loop body runs once per event, so keep it to the minimum number of
+    # dict probes: a ``Return`` key is only looked for when ``Call`` is absent,
+    # except for the (invalid) case where both are present. The running depth
+    # is ``calls - returns``, so it is not tracked separately.
     for index, event in enumerate(events):
-        is_call = "Call" in event
-        is_return = "Return" in event
-
-        if is_call and is_return:
-            raise TraceBalanceError(
-                f"event #{index} contains both Call and Return payloads, which is unsupported"
-            )
-
-        if is_call:
+        # ``in`` would also "work" on strings and lists, so reject anything
+        # that is not a mapping before probing. The dict check is the fast
+        # path; the ABC check only runs for other mapping types.
+        if not isinstance(event, dict) and not isinstance(event, Mapping):
+            raise _not_an_object(index, event)
+        if "Call" in event:
+            if "Return" in event:
+                raise TraceBalanceError(
+                    f"event #{index} contains both Call and Return payloads, which is unsupported"
+                )
             calls += 1
-            active_calls += 1
-        if is_return:
+        elif "Return" in event:
             returns += 1
-            active_calls -= 1
-            if active_calls < 0 and first_negative_index is None:
+            if first_negative_index is None and returns > calls:
                 first_negative_index = index
+                if early_exit:
+                    break
+
+    return TraceBalanceResult(
+        call_count=calls,
+        return_count=returns,
+        first_negative_index=first_negative_index,
+    )
+
+
+def summarize_trace_file(trace_path: Path) -> TraceBalanceResult:
+    """Return a balance summary for ``trace.json`` without building event objects.
+
+    The Rust extension streams the file and only looks at each event's
+    top-level keys. When the extension is unavailable this is equivalent to
+    ``summarize_trace_balance(iter_trace_events(trace_path))``.
+    """
+    if _summarize_trace_file is None:
+        return summarize_trace_balance(iter_trace_events(trace_path))
+
+    try:
+        calls, returns, first_negative_index = _summarize_trace_file(os.fspath(trace_path))
+    except FileNotFoundError as exc:
+        raise TraceBalanceError(f"trace file not found: {trace_path}") from exc
+    except OSError as exc:  # pragma: no cover - surfaced in tests via mocked IO
+        raise TraceBalanceError(f"unable to read trace file: {trace_path}") from exc
+    except ValueError as exc:
+        raise TraceBalanceError(f"invalid trace file: {trace_path}: {exc}") from exc
 
     return TraceBalanceResult(
         call_count=calls,
@@ -99,6 +243,8 @@ def summarize_trace_balance(events: Iterable[Mapping[str, Any]]) -> TraceBalance
 __all__ = [
     "TraceBalanceError",
     "TraceBalanceResult",
+    "iter_trace_events",
     "load_trace_events",
     "summarize_trace_balance",
+    "summarize_trace_file",
 ]
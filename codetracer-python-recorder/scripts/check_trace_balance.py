@@ -9,8 +9,9 @@ from typing import Sequence
 
 from codetracer_python_recorder.trace_balance import (
     TraceBalanceError,
-    load_trace_events,
+    iter_trace_events,
     summarize_trace_balance,
+    summarize_trace_file,
 )
 
 
@@ -23,6 +24,14 @@ def build_parser() -> argparse.ArgumentParser:
         type=Path,
         help="Path to trace.json emitted by Codetracer",
     )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help=(
+            "Stop reading at the first unmatched return event. "
+            "Event counts then only cover the trace up to that point."
+        ),
+    )
     return parser
 
 
@@ -33,8 +42,12 @@ def main(argv: Sequence[str] | None = None) -> int:
     trace_path = args.trace
 
     try:
-        events = load_trace_events(trace_path)
-        result = summarize_trace_balance(events)
+        if args.fail_fast:
+            # A balanced trace is still read to the end, so its counts
+            # are complete; only an underflow stops the scan early.
+            result = summarize_trace_balance(iter_trace_events(trace_path), early_exit=True)
+        else:
+            result = summarize_trace_file(trace_path)
     except TraceBalanceError as exc:
         print(f"error: {exc}", file=sys.stderr)
         return 2
@@ -61,6 +74,8 @@ def main(argv: Sequence[str] | None = None) -> int:
             "The first unmatched return appears at event "
             f"#{result.first_negative_index} (0-based index)."
         )
+        if args.fail_fast:
+            print("Stopped at that event (--fail-fast); counts cover the trace up to it.")
 
     return 1
 
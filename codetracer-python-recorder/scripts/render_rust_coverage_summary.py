@@ -4,16 +4,26 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import pathlib
 import sys
+from operator import itemgetter
 from typing import Dict, Iterable, List, Tuple
 
+try:
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - orjson is an optional accelerator
+    _orjson = None
+
 
 def _load_payload(summary_path: pathlib.Path) -> Dict:
     try:
-        return json.loads(summary_path.read_text(encoding="utf-8"))
+        raw = summary_path.read_bytes()
     except FileNotFoundError as exc:
         raise SystemExit(f"Rust coverage summary not found: {summary_path}") from exc
+    if _orjson is not None:
+        return _orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
 
 
 def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
@@ -47,6 +57,7 @@ def load_summary(
         payload = _load_payload(summary_path)
 
     repo_root = repo_root.resolve()
+    root_prefix = os.path.join(str(repo_root), "")
     rows: List[Tuple[str, int, int, float]] = []
 
     totals: Dict[str, float] = {}
@@ -60,10 +71,8 @@ def load_summary(
             filename = entry.get("filename")
             if not filename:
                 continue
-            path = pathlib.Path(filename)
-            try:
-                rel_path = path.resolve().relative_to(repo_root)
-            except Exception:
+            rel_path = _relative_path(filename, repo_root, root_prefix)
+            if rel_path is None:
                 # Skip entries outside the repository (stdlib, third-party deps, etc.).
                 continue
 
@@ -78,11 +87,32 @@ def load_summary(
             agg_total, agg_covered = crate_totals.get(crate_key, (0, 0))
             crate_totals[crate_key] = (agg_total + total, agg_covered + covered)
 
-    rows.sort(key=lambda item: item[0])
+    rows.sort(key=itemgetter(0))
     return rows, totals, crate_totals
 
 
-def _crate_key(rel_path: pathlib.Path) -> str:
+def _relative_path(
+    filename: str, repo_root: pathlib.Path, root_prefix: str
+) -> pathlib.PurePath | None:
+    """Return *filename* relative to *repo_root*, or ``None`` when outside it.
+
+    cargo-llvm-cov reports absolute paths, so those are matched against the
+    resolved root with a string prefix test instead of a per-file
+    ``Path.resolve()`` (which stats the file system). Relative names still
+    go through ``resolve()``.
+    """
+    if os.path.isabs(filename):
+        normalized = os.path.normpath(filename)
+        if not normalized.startswith(root_prefix):
+            return None
+        return pathlib.PurePath(normalized[len(root_prefix):])
+    try:
+        return pathlib.Path(filename).resolve().relative_to(repo_root)
+    except Exception:
+        return None
+
+
+def _crate_key(rel_path: pathlib.PurePath) -> str:
     parts = rel_path.parts
     if len(parts) >= 3 and parts[1] == "crates":
         return "/".join(parts[:3])
@@ -94,12 +124,11 @@ def render(rows: List[Tuple[str, int, int, float]]) -> str:
         return "Rust coverage summary: no project files found"
 
     name_width = max(len(name) for name, *_ in rows)
-    lines = ["Rust coverage summary (lines):", f"{'Name'.ljust(name_width)}  Lines  Miss  Cover"]
+    # Build the row format once instead of padding each name separately.
+    row_format = f"{{:<{name_width}}}  {{:5d}}  {{:4d}}  {{:5.1f}}%"
+    header = f"Rust coverage summary (lines):\n{'Name'.ljust(name_width)}  Lines  Miss  Cover"
 
-    for name, total, missed, percent in rows:
-        lines.append(f"{name.ljust(name_width)}  {total:5d}  {missed:4d}  {percent:5.1f}%")
-
-    return "\n".join(lines)
+    return "\n".join([header, *(row_format.format(*row) for row in rows)])
 
 
 def render_crates(crate_totals: Dict[str, Tuple[int, int]]) -> str:
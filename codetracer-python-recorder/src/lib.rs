@@ -13,6 +13,7 @@ pub mod monitoring;
 mod policy;
 mod runtime;
 mod session;
+mod trace_balance;
 pub mod trace_filter;
 
 pub use crate::code_object::{CodeObjectRegistry, CodeObjectWrapper};
@@ -173,5 +174,6 @@ fn codetracer_python_recorder(_py: Python<'_>, m: &Bound<'_, PyModule>) -> PyRes
     m.add_function(wrap_pyfunction!(policy::py_configure_policy_from_env, m)?)?;
     m.add_function(wrap_pyfunction!(policy::py_policy_snapshot, m)?)?;
     m.add_function(wrap_pyfunction!(managed_upload_materialized_trace, m)?)?;
+    m.add_function(wrap_pyfunction!(trace_balance::summarize_trace_file, m)?)?;
     Ok(())
 }
@@ -1,6 +1,7 @@
 use crate::runtime::io_capture::events::IoStream;
 use crate::runtime::io_capture::sink::{IoChunk, IoChunkConsumer, IoChunkFlags};
 use log::warn;
+use memchr::memchr;
 use std::collections::VecDeque;
 use std::io;
 use std::os::fd::{AsRawFd, FromRawFd, OwnedFd, RawFd};
@@ -104,8 +105,12 @@ impl Ledger {
                 }
 
                 if chunk[idx] != remaining[0] {
-                    leftover.push(chunk[idx]);
-                    idx += 1;
+                    // Bytes before the next occurrence of the ledger head byte
+                    // cannot start a match, so copy the whole native run at
+                    // once instead of stepping through it byte by byte.
+                    let skip = memchr(remaining[0], &chunk[idx..]).unwrap_or(chunk.len() - idx);
+                    leftover.extend_from_slice(&chunk[idx..idx + skip]);
+                    idx += skip;
                     continue;
                 }
 
@@ -341,6 +346,20 @@ fn wait_for_join(
 mod tests {
     use super::*;
 
+    #[test]
+    fn subtract_from_chunk_keeps_native_bytes_around_ledger_entries() {
+        let ledger = Arc::new(Ledger::new());
+        ledger.begin_entry(b"[proxy] one\n").commit();
+        ledger.begin_entry(b"[proxy] two\n").commit();
+
+        let leftover =
+            ledger.subtract_from_chunk(b"native a\n[proxy] one\n[pnative b\n[proxy] two\ntail");
+
+        assert_eq!(leftover, b"native a\n[pnative b\ntail");
+        let entries = ledger.entries.lock().expect("ledger lock poisoned");
+        assert!(entries.is_empty());
+    }
+
     #[test]
     fn wait_for_join_succeeds_for_completed_thread() {
         let handle = thread::spawn(|| {});
@@ -0,0 +1,222 @@
+//! Call/return balance scan over legacy `trace.json` event arrays.
+//!
+//! Backs `codetracer_python_recorder.trace_balance.summarize_trace_file`.
+//! The scan streams the file through `serde_json` and only inspects the
+//! top-level keys of each event object; payloads are skipped with
+//! `IgnoredAny`, so no event is ever materialised as a Python object.
+
+use std::fmt;
+use std::fs::File;
+use std::io::{BufReader, Read};
+
+use pyo3::exceptions::PyValueError;
+use pyo3::prelude::*;
+use serde::de::{self, DeserializeSeed, Deserializer, IgnoredAny, MapAccess, SeqAccess, Visitor};
+
+use crate::ffi;
+
+const READ_BUFFER_BYTES: usize = 64 * 1024;
+
+/// Call/return counters for one event stream.
+#[derive(Debug, Default, Clone, Copy, PartialEq, Eq)]
+pub struct BalanceSummary {
+    pub calls: u64,
+    pub returns: u64,
+    pub first_negative_index: Option<u64>,
+}
+
+/// Scan a JSON array of trace events read from `reader`.
+pub fn scan_trace_events<R: Read>(reader: R) -> serde_json::Result<BalanceSummary> {
+    let mut deserializer = serde_json::Deserializer::from_reader(reader);
+    let summary = (&mut deserializer).deserialize_seq(EventArrayVisitor)?;
+    deserializer.end()?;
+    Ok(summary)
+}
+
+/// Count call/return events in a legacy `trace.json` file.
+///
+/// Returns `(calls, returns, first_negative_index)`. I/O failures surface as
+/// `OSError`; malformed JSON or unsupported events raise `ValueError`.
+#[pyfunction]
+pub fn summarize_trace_file(py: Python<'_>, path: &str) -> PyResult<(u64, u64, Option<u64>)> {
+    ffi::wrap_pyfunction("summarize_trace_file", || {
+        let summary = py.allow_threads(|| -> PyResult<BalanceSummary> {
+            let file = File::open(path)?;
+            scan_trace_events(BufReader::with_capacity(READ_BUFFER_BYTES, file)).map_err(|err| {
+                if err.is_io() {
+                    PyErr::from(std::io::Error::from(err))
+                } else {
+                    PyValueError::new_err(err.to_string())
+                }
+            })
+        })?;
+        Ok((summary.calls, summary.returns, summary.first_negative_index))
+    })
+}
+
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+enum EventTag {
+    Call,
+    Return,
+    Other,
+}
+
+struct EventArrayVisitor;
+
+impl<'de> Visitor<'de> for EventArrayVisitor {
+    type Value = BalanceSummary;
+
+    fn expecting(&self, formatter: &mut fmt::Formatter) -> fmt::Result {
+        formatter.write_str("a JSON array of trace events")
+    }
+
+    fn visit_seq<A: SeqAccess<'de>>(self, mut seq: A) -> Result<BalanceSummary, A::Error> {
+        let mut summary = BalanceSummary::default();
+        let mut index: u64 = 0;
+        while let Some(tag) = seq.next_element_seed(EventSeed { index })? {
+            match tag {
+                EventTag::Call => summary.calls += 1,
+                EventTag::Return => {
+                    summary.returns += 1;
+                    if summary.first_negative_index.is_none() && summary.returns > summary.calls {
+                        summary.first_negative_index = Some(index);
+                    }
+                }
+                EventTag::Other => {}
+            }
+            index += 1;
+        }
+        Ok(summary)
+    }
+}
+
+/// Classifies a single event object by its `Call` / `Return` keys.
+struct EventSeed {
+    index: u64,
+}
+
+impl<'de> DeserializeSeed<'de> for EventSeed {
+    type Value = EventTag;
+
+    fn deserialize<D: Deserializer<'de>>(self, deserializer: D) -> Result<EventTag, D::Error> {
+        deserializer.deserialize_map(self)
+    }
+}
+
+impl<'de> Visitor<'de> for EventSeed {
+    type Value = EventTag;
+
+    fn expecting(&self, formatter: &mut fmt::Formatter) -> fmt::Result {
+        write!(formatter, "event #{} to be a JSON object", self.index)
+    }
+
+    fn visit_map<A: MapAccess<'de>>(self, mut map: A) -> Result<EventTag, A::Error> {
+        let mut has_call = false;
+        let mut has_return = false;
+        while let Some(key) = map.next_key_seed(EventKeySeed)? {
+            match key {
+                EventKey::Call => has_call = true,
+                EventKey::Return => has_return = true,
+                EventKey::Other => {}
+            }
+            map.next_value::<IgnoredAny>()?;
+        }
+        match (has_call, has_return) {
+            (true, true) => Err(de::Error::custom(format_args!(
+                "event #{} contains both Call and Return payloads, which is unsupported",
+                self.index
+            ))),
+            (true, false) => Ok(EventTag::Call),
+            (false, true) => Ok(EventTag::Return),
+            (false, false) => Ok(EventTag::Other),
+        }
+    }
+}
+
+enum EventKey {
+    Call,
+    Return,
+    Other,
+}
+
+struct EventKeySeed;
+
+impl<'de> DeserializeSeed<'de> for EventKeySeed {
+    type Value = EventKey;
+
+    fn deserialize<D: Deserializer<'de>>(self, deserializer: D) -> Result<EventKey, D::Error> {
+        deserializer.deserialize_identifier(self)
+    }
+}
+
+impl<'de> Visitor<'de> for EventKeySeed {
+    type Value = EventKey;
+
+    fn expecting(&self, formatter: &mut fmt::Formatter) -> fmt::Result {
+        formatter.write_str("an event key")
+    }
+
+    fn visit_str<E: de::Error>(self, value: &str) -> Result<EventKey, E> {
+        Ok(match value {
+            "Call" => EventKey::Call,
+            "Return" => EventKey::Return,
+            _ => EventKey::Other,
+        })
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn scan(raw: &str) -> serde_json::Result<BalanceSummary> {
+        scan_trace_events(raw.as_bytes())
+    }
+
+    #[test]
+    fn counts_balanced_trace() {
+        let summary =
+            scan(r#"[{"Call": {"function_id": 0}}, {"Step": {"line": 1}}, {"Return": {}}]"#)
+                .expect("balanced trace scans");
+        assert_eq!(
+            summary,
+            BalanceSummary {
+                calls: 1,
+                returns: 1,
+                first_negative_index: None,
+            }
+        );
+    }
+
+    #[test]
+    fn reports_first_negative_index() {
+        let summary = scan(r#"[{"Return": {}}, {"Call": {}}, {"Return": {}}, {"Return": {}}]"#)
+            .expect("unbalanced trace scans");
+        assert_eq!(summary.calls, 1);
+        assert_eq!(summary.returns, 3);
+        assert_eq!(summary.first_negative_index, Some(0));
+    }
+
+    #[test]
+    fn rejects_non_array_root() {
+        let err = scan(r#"{"Call": {}}"#).expect_err("object root is rejected");
+        assert!(err.to_string().contains("JSON array"), "{err}");
+    }
+
+    #[test]
+    fn rejects_non_object_event() {
+        let err = scan(r#"[{"Call": {}}, 3]"#).expect_err("scalar event is rejected");
+        assert!(err.to_string().contains("event #1"), "{err}");
+    }
+
+    #[test]
+    fn rejects_call_and_return_in_one_event() {
+        let err = scan(r#"[{"Call": {}, "Return": {}}]"#).expect_err("mixed event is rejected");
+        assert!(err.to_string().contains("both Call and Return"), "{err}");
+    }
+
+    #[test]
+    fn rejects_trailing_data() {
+        assert!(scan("[] []").is_err());
+    }
+}
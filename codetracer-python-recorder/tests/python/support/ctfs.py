@@ -38,9 +38,11 @@ import os
 import runpy
 import subprocess
 import sys
+from array import array
 from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, NamedTuple, Tuple
 
 import codetracer_python_recorder as codetracer
 
@@ -213,27 +215,76 @@ class ParsedCtfsTrace:
     * ``returns``       — ordered ``{"return_value": ...}`` payloads from
       every ``call_exit`` (and standalone return), preserving order.
     * ``steps``         — ordered ``(path_id, line)`` of every step.
+      The same data is available column-wise as ``step_path_ids`` /
+      ``step_lines`` (``array('q')``), which is cheaper to hold and
+      scan for large traces.
     * ``varnames``      — interned variable-name table.
+
+    The interning tables are stored as decoded.  The event projections
+    (``functions`` onwards) are built together in one pass over
+    ``events`` the first time any of them is read, so a test that only
+    looks at the tables never walks the event stream.
     """
 
     paths: List[str]
-    functions: List[Dict[str, Any]]
+    function_names: List[str]
+    varnames: List[str]
+    events: List[Dict[str, Any]] = field(default_factory=list)
+
+    @cached_property
+    def _projection(self) -> _EventProjection:
+        return _project_events(self.events)
+
+    @cached_property
+    def functions(self) -> List[Dict[str, Any]]:
+        function_path_ids = self._projection.function_path_ids
+        return [
+            {"name": name, "path_id": function_path_ids.get(fid, -1)}
+            for fid, name in enumerate(self.function_names)
+        ]
+
+    @property
+    def calls(self) -> List[int]:
+        return self._projection.calls
+
+    @property
+    def call_records(self) -> List[Dict[str, Any]]:
+        return self._projection.call_records
+
+    @property
+    def returns(self) -> List[Dict[str, Any]]:
+        return self._projection.returns
+
+    @property
+    def step_path_ids(self) -> array:
+        return self._projection.step_path_ids
+
+    @property
+    def step_lines(self) -> array:
+        return self._projection.step_lines
+
+    @cached_property
+    def steps(self) -> List[Tuple[int, int]]:
+        return list(zip(self.step_path_ids, self.step_lines))
+
+
+class _EventProjection(NamedTuple):
+    function_path_ids: Dict[int, int]
     calls: List[int]
     call_records: List[Dict[str, Any]]
     returns: List[Dict[str, Any]]
-    steps: List[Tuple[int, int]]
-    varnames: List[str]
-    events: List[Dict[str, Any]] = field(default_factory=list)
+    step_path_ids: array
+    step_lines: array
 
 
-def parse_ctfs_trace(ct_path: Path) -> ParsedCtfsTrace:
-    """Decode *ct_path* and adapt it to :class:`ParsedCtfsTrace`.
+def _project_events(events: List[Dict[str, Any]]) -> _EventProjection:
+    """Bucket *events* into the legacy ``trace.json`` projections.
 
     P1.5 (Column-Aware-Tracing-And-Deminification milestone): step
     events emitted by the column-aware native recorder carry an
     additional ``column`` field that the legacy
     ``codetracer-pure-python-recorder`` JSON oracle does NOT emit.
-    The ``steps`` list deliberately projects each event to
+    The step columns deliberately project each event to
     ``(path_id, line)`` only — dropping ``column`` — so any cross-
     validation that compares native vs pure-python step streams stays
     on a level playing field.  Tests that want to assert on the
@@ -242,34 +293,34 @@ def parse_ctfs_trace(ct_path: Path) -> ParsedCtfsTrace:
     ``tests/python/test_column_aware_steps.py`` for the canonical
     column-aware acceptance pattern.
     """
-    bundle = ct_print_full(ct_path)
-
-    paths: List[str] = list(bundle["paths"])
-    function_names: List[str] = list(bundle["functions"])
-    varnames: List[str] = list(bundle["varnames"])
-    events: List[Dict[str, Any]] = list(bundle["events"])
-
-    # Recover each function's defining path_id from the step events that
-    # run inside it.  The CTFS function table interns names only; step
-    # events carry both function_id and path_id, which is how the writer
-    # links a function to its source file.
     function_path_ids: Dict[int, int] = {}
-    for event in events:
-        if event.get("kind") == "step" and "function_id" in event and "path_id" in event:
-            function_path_ids.setdefault(int(event["function_id"]), int(event["path_id"]))
-
-    functions: List[Dict[str, Any]] = []
-    for fid, name in enumerate(function_names):
-        functions.append({"name": name, "path_id": function_path_ids.get(fid, -1)})
-
     calls: List[int] = []
     call_records: List[Dict[str, Any]] = []
     returns: List[Dict[str, Any]] = []
-    steps: List[Tuple[int, int]] = []
+    step_path_ids = array("q")
+    step_lines = array("q")
 
+    # Single pass over the events; steps dominate, so they are tested first.
     for event in events:
         kind = event.get("kind")
-        if kind == "call_entry":
+        if kind == "step":
+            if "path_id" not in event:
+                continue
+            path_id = int(event["path_id"])
+            # Recover each function's defining path_id from the step events
+            # that run inside it.  The CTFS function table interns names
+            # only; step events carry both function_id and path_id, which is
+            # how the writer links a function to its source file.
+            if "function_id" in event:
+                function_path_ids.setdefault(int(event["function_id"]), path_id)
+            if "line" in event:
+                # P1.5: deliberately drop the per-step ``column`` field
+                # so the projected step columns stay oracle-compatible
+                # with the column-blind pure-python recorder.  Tests
+                # that need column data walk ``events`` directly.
+                step_path_ids.append(path_id)
+                step_lines.append(int(event["line"]))
+        elif kind == "call_entry":
             calls.append(int(event["function_id"]))
             # ``call_entry.args`` already carries decoded ValueRecords;
             # expose it under the legacy ``args`` key so callers reuse
@@ -277,21 +328,18 @@ def parse_ctfs_trace(ct_path: Path) -> ParsedCtfsTrace:
             call_records.append(event)
         elif kind == "call_exit":
             returns.append({"return_value": event.get("return_value")})
-        elif kind == "step":
-            if "path_id" in event and "line" in event:
-                # P1.5: deliberately drop the per-step ``column`` field
-                # so the projected ``steps`` list stays oracle-compatible
-                # with the column-blind pure-python recorder.  Tests
-                # that need column data walk ``events`` directly.
-                steps.append((int(event["path_id"]), int(event["line"])))
 
+    return _EventProjection(
+        function_path_ids, calls, call_records, returns, step_path_ids, step_lines
+    )
+
+
+def parse_ctfs_trace(ct_path: Path) -> ParsedCtfsTrace:
+    """Decode *ct_path* and adapt it to :class:`ParsedCtfsTrace`."""
+    bundle = ct_print_full(ct_path)
     return ParsedCtfsTrace(
-        paths=paths,
-        functions=functions,
-        calls=calls,
-        call_records=call_records,
-        returns=returns,
-        steps=steps,
-        varnames=varnames,
-        events=events,
+        paths=list(bundle["paths"]),
+        function_names=list(bundle["functions"]),
+        varnames=list(bundle["varnames"]),
+        events=list(bundle["events"]),
     )
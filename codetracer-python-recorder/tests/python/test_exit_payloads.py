@@ -19,20 +19,52 @@ reader from ``codetracer-trace-format-nim``, exactly as
 recorder records the exact exit code / placeholder as the top-level
 return — is unchanged in strength: a recorder that drops or corrupts
 the exit payload still fails the test loudly.
+
+The CLI cases run the recorder in a child process, because they assert
+on the process exit status and stderr; the placeholder case drives the
+session API in-process.
 """
 from __future__ import annotations
 
-import json
 import subprocess
 import sys
 from pathlib import Path
 
+import pytest
+
+import codetracer_python_recorder as codetracer
+
 from .support.ctfs import ct_print_full, find_ct_file
 
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
 
 
+@pytest.fixture(autouse=True)
+def reset_policy() -> None:
+    codetracer.configure_policy(
+        on_recorder_error="abort",
+        require_trace=False,
+        keep_partial_trace=False,
+        log_level="",
+        log_file="",
+        json_errors=False,
+        module_name_from_globals=True,
+        propagate_script_exit=False,
+    )
+    yield
+    codetracer.configure_policy(
+        on_recorder_error="abort",
+        require_trace=False,
+        keep_partial_trace=False,
+        log_level="",
+        log_file="",
+        json_errors=False,
+        module_name_from_globals=True,
+        propagate_script_exit=False,
+    )
+
+
 def _all_return_values(trace_dir: Path) -> list[dict[str, object]]:
     """Return every decoded ``call_exit.return_value`` in event order.
 
@@ -169,15 +201,8 @@ def test_default_exit_payload_uses_placeholder(tmp_path: Path) -> None:
     # Directly call the start/stop API without providing an exit code.
     # A session stopped this way records the ``<exit>`` placeholder as the
     # top-level return value rather than a concrete integer.
-    script = (
-        "import json\n"
-        "from pathlib import Path\n"
-        "import codetracer_python_recorder as codetracer\n"
-        f"trace_dir = Path({json.dumps(str(trace_dir))!s})\n"
-        "session = codetracer.start(trace_dir)\n"
-        "session.stop()\n"
-    )
-    subprocess.run([sys.executable, "-c", script], check=True)
+    session = codetracer.start(trace_dir)
+    session.stop()
 
     # ``emit_session_exit`` registers exactly one session-exit return; for
     # a session stopped without an exit code it is the ``<exit>`` String
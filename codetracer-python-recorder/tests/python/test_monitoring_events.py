@@ -16,7 +16,7 @@ them still fails the test loudly.
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 import pytest
 
@@ -52,35 +52,47 @@ def _function_ids(parsed: ParsedCtfsTrace, name: str, path_id: int) -> List[int]
     ]
 
 
+# Keep lines compact and predictable to assert step line numbers.  ``foo``
+# covers PY_START / LINE / PY_RETURN; ``bar`` covers recorded call arguments.
+# ``foo`` runs first so its return is the first one in the trace.
+_SIMPLE_SCRIPT = (
+    b"# simple script\n\n"
+    b"def foo():\n"
+    b"    x = 1\n"
+    b"    y = 2\n"
+    b"    return x + y\n\n"
+    b"def bar(a, b):\n"
+    b"    return a if len(str(b)) > 0 else 0\n\n"
+    b"if __name__ == '__main__':\n"
+    b"    r = foo()\n"
+    b"    print(r)\n"
+    b"    bar(1, 'x')\n"
+)
+
+
 def _write_script(tmp: Path) -> Path:
-    # Keep lines compact and predictable to assert step line numbers.
-    code = (
-        "# simple script\n\n"
-        "def foo():\n"
-        "    x = 1\n"
-        "    y = 2\n"
-        "    return x + y\n\n"
-        "if __name__ == '__main__':\n"
-        "    r = foo()\n"
-        "    print(r)\n"
-    )
     p = tmp / "script.py"
-    p.write_text(code)
+    p.write_bytes(_SIMPLE_SCRIPT)
     return p
 
 
-def test_py_start_line_and_return_events_are_recorded(tmp_path: Path) -> None:
-    # Arrange: create a script and start tracing with activation restricted
-    # to that file.
-    script = _write_script(tmp_path)
-    out_dir = ensure_trace_dir(tmp_path)
+@pytest.fixture(scope="module")
+def simple_trace(tmp_path_factory: pytest.TempPathFactory) -> Tuple[Path, ParsedCtfsTrace]:
+    """Record ``_SIMPLE_SCRIPT`` once and share the decoded trace.
 
-    # Act: record the script via the public recorder API.  The recorder
-    # emits a single CTFS ``.ct`` container; ``record_script`` returns it
-    # and asserts the legacy ``trace.json`` sidecar is NOT produced.
-    trace_ct = record_script(out_dir, script)
+    The recorder emits a single CTFS ``.ct`` container; ``record_script``
+    returns it and activation is restricted to the script.
+    """
+    tmp = tmp_path_factory.mktemp("simple_trace")
+    script = _write_script(tmp)
+    trace_ct = record_script(ensure_trace_dir(tmp), script)
+    return script, parse_ctfs_trace(trace_ct)
 
-    parsed = parse_ctfs_trace(trace_ct)
+
+def test_py_start_line_and_return_events_are_recorded(
+    simple_trace: Tuple[Path, ParsedCtfsTrace],
+) -> None:
+    script, parsed = simple_trace
 
     # The script path must be present (activation gating starts there, but
     # other helper modules like codecs may also appear during execution).
@@ -104,14 +116,18 @@ def test_py_start_line_and_return_events_are_recorded(tmp_path: Path) -> None:
     assert rv.get("kind") == "Int" and rv.get("i") == 3
 
     # LINE events: confirm that the key lines within foo() were stepped.
-    # Compute concrete line numbers by scanning the file content.
-    lines = script.read_text().splitlines()
-    want_lines = {
-        next(i + 1 for i, t in enumerate(lines) if t.strip() == "x = 1"),
-        next(i + 1 for i, t in enumerate(lines) if t.strip() == "y = 2"),
-        next(i + 1 for i, t in enumerate(lines) if t.strip() == "return x + y"),
+    # Compute concrete line numbers from a single index of the script source
+    # (already in memory, so the written file is not read back).
+    line_index = {
+        text.strip(): lineno
+        for lineno, text in enumerate(_SIMPLE_SCRIPT.decode().splitlines(), start=1)
+    }
+    want_lines = {line_index["x = 1"], line_index["y = 2"], line_index["return x + y"]}
+    seen_lines = {
+        ln
+        for pid, ln in zip(parsed.step_path_ids, parsed.step_lines)
+        if pid == script_path_id
     }
-    seen_lines = {ln for pid, ln in parsed.steps if pid == script_path_id}
     assert want_lines.issubset(seen_lines), f"Missing expected step lines: {want_lines - seen_lines}"
 
 
@@ -125,34 +141,23 @@ def test_start_while_active_raises(tmp_path: Path) -> None:
         codetracer.stop()
 
 
-def test_call_arguments_recorded_on_py_start(tmp_path: Path) -> None:
-    # Arrange: write a simple script with a function that accepts two args.
-    code = (
-        "def foo(a, b):\n"
-        "    return a if len(str(b)) > 0 else 0\n\n"
-        "if __name__ == '__main__':\n"
-        "    foo(1, 'x')\n"
-    )
-    script = tmp_path / "script_args.py"
-    script.write_text(code)
-
-    out_dir = tmp_path / "trace_out"
-    trace_ct = record_script(out_dir, script)
+def test_call_arguments_recorded_on_py_start(
+    simple_trace: Tuple[Path, ParsedCtfsTrace],
+) -> None:
+    script, parsed = simple_trace
 
-    parsed = parse_ctfs_trace(trace_ct)
-
-    # Locate foo() function id in this script.
+    # Locate bar() function id in this script.
     assert str(script) in parsed.paths
     script_path_id = parsed.paths.index(str(script))
-    foo_fids = _function_ids(parsed, "foo", script_path_id)
-    assert foo_fids, "Expected function entry for foo()"
-    foo_fid = foo_fids[0]
+    bar_fids = _function_ids(parsed, "bar", script_path_id)
+    assert bar_fids, "Expected function entry for bar()"
+    bar_fid = bar_fids[0]
 
-    # Find the first Call to foo() and assert it carries two args with
+    # Find the first Call to bar() and assert it carries two args with
     # correct names/values.
-    foo_calls = [cr for cr in parsed.call_records if int(cr["function_id"]) == foo_fid]
-    assert foo_calls, "Expected a recorded call to foo()"
-    call = foo_calls[0]
+    bar_calls = [cr for cr in parsed.call_records if int(cr["function_id"]) == bar_fid]
+    assert bar_calls, "Expected a recorded call to bar()"
+    call = bar_calls[0]
     args = call.get("args", [])
     assert len(args) == 2, f"Expected 2 args, got: {args}"
 
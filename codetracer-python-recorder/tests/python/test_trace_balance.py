@@ -11,8 +11,10 @@ import codetracer_python_recorder as codetracer
 from codetracer_python_recorder.trace_balance import (
     TraceBalanceError,
     TraceBalanceResult,
+    iter_trace_events,
     load_trace_events,
     summarize_trace_balance,
+    summarize_trace_file,
 )
 
 
@@ -22,7 +24,9 @@ def _write_trace(tmp_path: Path, events: List[Mapping[str, object]]) -> Path:
     return path
 
 
-def _load_cli() -> object:
+@pytest.fixture(scope="session")
+def balance_cli() -> object:
+    """Load ``scripts/check_trace_balance.py`` once for all CLI tests."""
     module_path = Path(__file__).parents[2] / "scripts" / "check_trace_balance.py"
     spec = importlib.util.spec_from_file_location("check_trace_balance", module_path)
     if spec is None or spec.loader is None:
@@ -65,6 +69,24 @@ def test_summarize_trace_balance_detects_unmatched_return() -> None:
     assert result.first_negative_index == 0
 
 
+def test_summarize_trace_balance_early_exit_stops_at_first_unmatched_return() -> None:
+    events = iter([{"Call": {}}, {"Return": {}}, {"Return": {}}, {"Call": {}}, "not an event"])
+
+    result = summarize_trace_balance(events, early_exit=True)
+
+    assert not result.is_balanced
+    assert result.first_negative_index == 2
+    assert (result.call_count, result.return_count) == (1, 2)
+    assert next(events) == {"Call": {}}
+
+
+def test_summarize_trace_balance_rejects_call_and_return_in_one_event() -> None:
+    events = [{"Call": {}}, {"Call": {}, "Return": {}}]
+
+    with pytest.raises(TraceBalanceError, match="event #1"):
+        summarize_trace_balance(events)
+
+
 def test_load_trace_events_validates_structure(tmp_path: Path) -> None:
     trace_path = _write_trace(tmp_path, [{"Call": {}}])
 
@@ -73,6 +95,18 @@ def test_load_trace_events_validates_structure(tmp_path: Path) -> None:
     assert events[0]["Call"] == {}
 
 
+def test_non_object_events_are_rejected(tmp_path: Path) -> None:
+    trace_path = tmp_path / "trace.json"
+    trace_path.write_text('[{"Call": {}}, "Return"]', encoding="utf-8")
+
+    with pytest.raises(TraceBalanceError, match="event #1"):
+        load_trace_events(trace_path)
+
+    events = load_trace_events(trace_path, validate=False)
+    with pytest.raises(TraceBalanceError, match="event #1"):
+        summarize_trace_balance(events)
+
+
 def test_load_trace_events_raises_on_non_array(tmp_path: Path) -> None:
     trace_path = tmp_path / "trace.json"
     trace_path.write_text("{}")
@@ -81,11 +115,53 @@ def test_load_trace_events_raises_on_non_array(tmp_path: Path) -> None:
         load_trace_events(trace_path)
 
 
-def test_cli_returns_non_zero_on_unbalanced(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+def test_load_trace_events_raises_on_invalid_json(tmp_path: Path) -> None:
+    trace_path = tmp_path / "trace.json"
+    trace_path.write_text('[{"Call": {}},', encoding="utf-8")
+
+    with pytest.raises(TraceBalanceError, match="invalid JSON"):
+        load_trace_events(trace_path)
+
+
+def test_iter_trace_events_streams_same_events(tmp_path: Path) -> None:
+    events = [{"Call": {}}, {"Step": {"line": 1}}, {"Return": {}}]
+    trace_path = _write_trace(tmp_path, events)
+
+    assert list(iter_trace_events(trace_path)) == events
+    assert summarize_trace_balance(iter_trace_events(trace_path)).is_balanced
+
+
+def test_iter_trace_events_raises_on_non_array(tmp_path: Path) -> None:
+    trace_path = tmp_path / "trace.json"
+    trace_path.write_text('  {"Call": {}}', encoding="utf-8")
+
+    with pytest.raises(TraceBalanceError):
+        list(iter_trace_events(trace_path))
+
+
+def test_summarize_trace_file_matches_event_summary(tmp_path: Path) -> None:
+    events = [{"Return": {}}, {"Call": {}}, {"Step": {"line": 1}}, {"Return": {}}]
+    trace_path = _write_trace(tmp_path, events)
+
+    assert summarize_trace_file(trace_path) == summarize_trace_balance(events)
+
+
+def test_summarize_trace_file_rejects_malformed_trace(tmp_path: Path) -> None:
+    trace_path = tmp_path / "trace.json"
+    trace_path.write_text('[{"Call": {}, "Return": {}}]', encoding="utf-8")
+
+    with pytest.raises(TraceBalanceError):
+        summarize_trace_file(trace_path)
+    with pytest.raises(TraceBalanceError, match="not found"):
+        summarize_trace_file(tmp_path / "missing.json")
+
+
+def test_cli_returns_non_zero_on_unbalanced(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str], balance_cli: object
+) -> None:
     trace_path = _write_trace(tmp_path, [{"Call": {}}, {"Return": {}}, {"Return": {}}])
-    cli = _load_cli()
 
-    exit_code = cli.main([str(trace_path)])
+    exit_code = balance_cli.main([str(trace_path)])
     captured = capsys.readouterr()
 
     assert exit_code == 1
@@ -93,17 +169,34 @@ def test_cli_returns_non_zero_on_unbalanced(tmp_path: Path, capsys: pytest.Captu
     assert "Unexpected 1 extra return event(s)." in captured.out
 
 
-def test_cli_reports_success_for_balanced_trace(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+def test_cli_reports_success_for_balanced_trace(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str], balance_cli: object
+) -> None:
     trace_path = _write_trace(tmp_path, [{"Call": {}}, {"Return": {}}])
-    cli = _load_cli()
 
-    exit_code = cli.main([str(trace_path)])
+    exit_code = balance_cli.main([str(trace_path)])
     captured = capsys.readouterr()
 
     assert exit_code == 0
     assert "Balanced trace" in captured.out
 
 
+def test_cli_fail_fast_stops_at_first_unmatched_return(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str], balance_cli: object
+) -> None:
+    trace_path = _write_trace(
+        tmp_path, [{"Call": {}}, {"Return": {}}, {"Return": {}}, {"Call": {}}, {"Call": {}}]
+    )
+
+    exit_code = balance_cli.main(["--fail-fast", str(trace_path)])
+    captured = capsys.readouterr()
+
+    assert exit_code == 1
+    assert "Call events   : 1" in captured.out
+    assert "#2 (0-based index)" in captured.out
+    assert "--fail-fast" in captured.out
+
+
 def test_activation_and_filter_skip_still_balances_trace(tmp_path: Path) -> None:
     script = tmp_path / "app.py"
     script.write_text(
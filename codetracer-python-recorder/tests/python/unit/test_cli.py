@@ -1,15 +1,18 @@
 """Unit tests for the recorder CLI helpers."""
 from __future__ import annotations
 
+import sys
 from pathlib import Path
 
 import pytest
 
-from codetracer_python_recorder import formats
+from codetracer_python_recorder import cli, formats
 from codetracer_python_recorder.cli import (
     ENV_DISABLED,
     ENV_OUT_DIR,
     _parse_args,
+    _patched_argv,
+    _target_argv,
     recording_disabled,
     resolve_out_dir,
 )
@@ -254,3 +257,40 @@ def test_parse_args_disables_module_name_from_globals(tmp_path: Path) -> None:
     assert config.policy_overrides == {
         "module_name_from_globals": False,
     }
+
+
+def test_parse_args_version_resolves_lazily(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str], tmp_path: Path
+) -> None:
+    lookups: list[bool] = []
+
+    def fake_version() -> str:
+        lookups.append(True)
+        return "1.2.3"
+
+    monkeypatch.setattr(cli, "_resolve_package_version", fake_version)
+    script = tmp_path / "entry.py"
+    _write_script(script)
+
+    _parse_args([str(script)])
+    assert lookups == []
+
+    with pytest.raises(SystemExit) as excinfo:
+        _parse_args(["--version"])
+    assert excinfo.value.code == 0
+    assert capsys.readouterr().out == "codetracer-python-recorder 1.2.3\n"
+    assert lookups == [True]
+
+
+def test_patched_argv_restores_argv_after_error(tmp_path: Path) -> None:
+    script = tmp_path / "entry.py"
+    _write_script(script)
+    config = _parse_args([str(script), "--flag"])
+    original = sys.argv
+
+    with pytest.raises(RuntimeError):
+        with _patched_argv(_target_argv(config)):
+            assert sys.argv == [str(script.resolve()), "--flag"]
+            raise RuntimeError("boom")
+
+    assert sys.argv is original
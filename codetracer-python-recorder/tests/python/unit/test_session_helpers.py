@@ -110,6 +110,19 @@ def test_trace_session_flush_noop_when_inactive(monkeypatch: pytest.MonkeyPatch)
     assert flushed == []
 
 
+def test_flush_skips_backend_query_for_active_session(monkeypatch: pytest.MonkeyPatch) -> None:
+    def fail_is_tracing() -> bool:
+        raise AssertionError("flush should not query the backend")
+
+    flushed = []
+    monkeypatch.setattr(session, "_is_tracing_backend", fail_is_tracing)
+    monkeypatch.setattr(session, "_flush_backend", lambda: flushed.append(True))
+
+    session._active_session = session.TraceSession(path=Path("/tmp"), format="json")
+    session.flush()
+    assert flushed == [True]
+
+
 def test_trace_context_manager_starts_and_stops(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
     calls = {"start": [], "stop": []}
 
@@ -19,42 +19,48 @@ import sys
 import threading
 import time
 from collections import deque
-from dataclasses import dataclass
-from typing import Deque, List, Sequence, Tuple
+from typing import Deque, Iterable, List, Sequence, Tuple
 
 
-@dataclass
-class LedgerEntry:
-    seq: int
-    data: bytes
-    offset: int = 0
+# Once this many consumed bytes sit at the front of the ledger buffer they are
+# dropped, so the buffer does not grow for the lifetime of the capture.
+LEDGER_COMPACT_BYTES = 64 * 1024
 
-    @property
-    def remaining(self) -> bytes:
-        return self.data[self.offset :]
-
-    def consume(self, size: int) -> bytes:
-        chunk = self.data[self.offset : self.offset + size]
-        self.offset += size
-        return chunk
+# Bytes requested per ``os.read`` in the mirror thread. Matches the default
+# Linux pipe capacity, so one read usually drains whatever is buffered.
+MIRROR_READ_SIZE = 1 << 16
 
-    def is_spent(self) -> bool:
-        return self.offset >= len(self.data)
+# ProxyStdout stages encoded writes and flushes them as one ledger entry and
+# one pipe write, either at the end of a line (like a line-buffered tty
+# ``sys.stdout``) or once this many bytes are staged. Staying at or below
+# PIPE_BUF (4096 on Linux) keeps each flush atomic with respect to concurrent
+# native writers.
+PROXY_STAGE_BYTES = 4096
 
 
 class Ledger:
-    """Thread-safe FIFO ledger that stores proxy writes."""
+    """Thread-safe FIFO ledger that stores proxy writes.
+
+    Payloads are appended to one ``bytearray``; ``_ends`` records where each
+    entry stops as ``(seq, end)`` pairs in logical offsets (``_base`` is the
+    logical offset of ``_buf[0]``). ``_head`` is the logical offset of the
+    first unconsumed byte, so matching compares straight against the shared
+    buffer without a per-entry object.
+    """
 
     def __init__(self) -> None:
-        self._entries: Deque[LedgerEntry] = deque()
+        self._buf = bytearray()
+        self._ends: Deque[Tuple[int, int]] = deque()
+        self._base = 0
+        self._head = 0
         self._lock = threading.Lock()
         self._seq = itertools.count()
 
     def push(self, payload: bytes) -> int:
-        seq = next(self._seq)
-        entry = LedgerEntry(seq=seq, data=payload)
         with self._lock:
-            self._entries.append(entry)
+            seq = next(self._seq)
+            self._buf += payload
+            self._ends.append((seq, self._base + len(self._buf)))
         return seq
 
     def subtract_from_chunk(self, chunk: bytes) -> Tuple[bytes, Sequence[Tuple[int, bytes]]]:
@@ -67,75 +73,102 @@ class Ledger:
         if not chunk:
             return b"", ()
 
-        leftover = bytearray()
         matched: List[Tuple[int, bytes]] = []
         idx = 0
-        view = memoryview(chunk)
+        size = len(chunk)
+        # ``chunk[run:idx]`` is the native run that has not been copied yet.
+        # Runs are only copied when a ledger match ends them, so divergent
+        # bytes no longer grow ``leftover`` one append at a time, and an
+        # unmatched chunk is returned without any copy.
+        run = 0
+        leftover = bytearray()
 
         with self._lock:
-            while idx < len(view):
-                # If the ledger is empty we can append the rest of the chunk.
-                if not self._entries:
-                    leftover.extend(view[idx:])
+            buf = self._buf
+            ends = self._ends
+            base = self._base
+            head = self._head
+            # First unconsumed ledger byte; only re-read after ``head`` moves.
+            head_byte = -1
+            # Fast path: a proxy write that arrives as one read is exactly the
+            # rest of the front entry, so a single comparison consumes it.
+            if ends and ends[0][1] - head == size and buf.startswith(chunk, head - base):
+                matched.append((ends.popleft()[0], chunk))
+                head += size
+                idx = run = size
+            while idx < size:
+                # If the ledger is empty the rest of the chunk is native.
+                if not ends:
                     break
 
-                entry = self._entries[0]
-                remaining = entry.remaining
-                if not remaining:
-                    self._entries.popleft()
+                seq, end = ends[0]
+                if head >= end:
+                    ends.popleft()
                     continue
 
-                # Skip native bytes that precede the next ledger entry.
-                if view[idx] != remaining[0]:
-                    leftover.append(view[idx])
-                    idx += 1
-                    continue
+                # Skip native bytes that precede the next ledger entry. ``find``
+                # scans in C, so runs of native output cost one call instead of
+                # one loop iteration per byte.
+                if head_byte < 0:
+                    head_byte = buf[head - base]
+                idx = chunk.find(head_byte, idx)
+                if idx < 0:
+                    break
 
-                # Full match fits inside the chunk.
-                full_len = len(remaining)
-                end_idx = idx + full_len
-                if end_idx <= len(view) and view[idx:end_idx].tobytes() == remaining:
-                    consumed = entry.consume(full_len)
-                    matched.append((entry.seq, consumed))
-                    idx = end_idx
-                    if entry.is_spent():
-                        self._entries.popleft()
+                # ``piece`` is the whole entry when it fits inside the chunk,
+                # otherwise the chunk tail (a partial match at the end).
+                piece = chunk[idx : idx + end - head]
+                if buf.startswith(piece, head - base):
+                    if idx > run:
+                        leftover += chunk[run:idx]
+                    matched.append((seq, piece))
+                    idx += len(piece)
+                    head += len(piece)
+                    run = idx
+                    head_byte = -1
+                    if head >= end:
+                        ends.popleft()
                     continue
 
-                # Partial match at the end of the chunk.
-                tail = view[idx:].tobytes()
-                prefix = remaining[: len(tail)]
-                if tail == prefix:
-                    consumed = entry.consume(len(tail))
-                    matched.append((entry.seq, consumed))
-                    idx = len(view)
-                    if entry.is_spent():
-                        self._entries.popleft()
-                    break
-
                 # The byte matches the ledger start but diverges immediately.
                 # Treat it as native output.
-                leftover.append(view[idx])
                 idx += 1
 
+            self._head = head
+            if not ends:
+                buf.clear()
+                self._base = head
+            elif head - base >= LEDGER_COMPACT_BYTES:
+                del buf[: head - base]
+                self._base = head
+
+        if not matched:
+            return (chunk, ())
+        leftover += chunk[run:]
         return (bytes(leftover), tuple(matched))
 
     def reset(self) -> None:
         with self._lock:
-            self._entries.clear()
+            self._buf.clear()
+            self._ends.clear()
+            self._base = self._head = 0
 
     def pending_bytes(self) -> int:
         with self._lock:
-            return sum(len(entry.remaining) for entry in self._entries)
+            return self._base + len(self._buf) - self._head
 
 
 class ProxyStdout:
     """Minimal stdout proxy that records writes into the ledger."""
 
-    def __init__(self, write_fd: int, ledger: Ledger, proxy_events: List[dict]) -> None:
+    def __init__(self, write_fd: int, ledger: Ledger) -> None:
         self._write_fd = write_fd
         self._ledger = ledger
-        self._events = proxy_events
+        # ``(seq, text)`` per write; see ``events`` for the debugging view.
+        self._records: List[Tuple[int, str]] = []
+        self._stage_text: List[str] = []
+        self._stage: List[bytes] = []
+        self._stage_len = 0
         self._lock = threading.RLock()
         self.encoding = "utf-8"
         self.errors = "strict"
@@ -148,27 +181,54 @@ class ProxyStdout:
             text = str(text)
         if not text:
             return 0
+        self._emit(text)
+        return len(text)
+
+    def _emit(self, text: str) -> None:
         data = text.encode(self.encoding, self.errors)
         with self._lock:
-            seq = self._ledger.push(data)
-            self._events.append(
-                {
-                    "thread": threading.get_ident(),
-                    "seq": seq,
-                    "text": text,
-                    "bytes": data,
-                }
-            )
-            os.write(self._write_fd, data)
-        return len(text)
+            if self._stage_len + len(data) > PROXY_STAGE_BYTES:
+                self._flush_stage()
+            self._stage_text.append(text)
+            self._stage.append(data)
+            self._stage_len += len(data)
+            if self._stage_len >= PROXY_STAGE_BYTES or "\n" in text:
+                self._flush_stage()
+
+    def _flush_stage(self) -> None:
+        """Push and write the staged bytes; the caller holds ``self._lock``."""
+        if not self._stage:
+            return
+        data = b"".join(self._stage)
+        seq = self._ledger.push(data)
+        # Writes flushed together share the ledger entry but keep one record
+        # each.
+        self._records.extend((seq, text) for text in self._stage_text)
+        os.write(self._write_fd, data)
+        self._stage_text.clear()
+        self._stage.clear()
+        self._stage_len = 0
 
-    def writelines(self, lines: Sequence[str]) -> None:
-        for line in lines:
-            self.write(line)
+    @property
+    def events(self) -> List[dict]:
+        """Recorded writes as dicts, built on demand rather than per write."""
+        return [
+            {"seq": seq, "text": text, "bytes": text.encode(self.encoding, self.errors)}
+            for seq, text in self._records
+        ]
+
+    def writelines(self, lines: Iterable[str]) -> None:
+        # One ledger entry and one pipe write for the whole batch, instead of
+        # a lock round-trip and a syscall per line.
+        if self.closed:
+            raise ValueError("write to closed proxy")
+        text = "".join(line if isinstance(line, str) else str(line) for line in lines)
+        if text:
+            self._emit(text)
 
     def flush(self) -> None:
-        # Pipe writes are already flushed.
-        return
+        with self._lock:
+            self._flush_stage()
 
     def fileno(self) -> int:
         return self._write_fd
@@ -178,6 +238,7 @@ class ProxyStdout:
 
     def close(self) -> None:
         if not self.closed:
+            self.flush()
             os.close(self._write_fd)
             self.closed = True
 
@@ -197,7 +258,7 @@ class FdMirror(threading.Thread):
     def run(self) -> None:
         try:
             while True:
-                chunk = os.read(self._read_fd, 1024)
+                chunk = os.read(self._read_fd, MIRROR_READ_SIZE)
                 if not chunk:
                     break
                 self.total_bytes += len(chunk)
@@ -224,14 +285,13 @@ class FdMirror(threading.Thread):
 
 def run_trial(trial_id: int, *, validate: bool = True) -> dict:
     orig_stdout = sys.stdout
-    proxy_events: List[dict] = []
     mirror_events: List[dict] = []
-    native_events: List[str] = []
-    native_lock = threading.Lock()
+    # One list per native thread, so the writers never contend on a lock.
+    native_events_per_thread: List[List[str]] = [[] for _ in range(2)]
 
     read_fd, write_fd = os.pipe()
     ledger = Ledger()
-    proxy_stdout = ProxyStdout(write_fd=write_fd, ledger=ledger, proxy_events=proxy_events)
+    proxy_stdout = ProxyStdout(write_fd=write_fd, ledger=ledger)
     sys.stdout = proxy_stdout
 
     mirror = FdMirror(read_fd=read_fd, ledger=ledger, mirror_events=mirror_events)
@@ -246,11 +306,10 @@ def run_trial(trial_id: int, *, validate: bool = True) -> dict:
             print(f"[proxy {idx}] message {i}")
             time.sleep(random.uniform(0.0, 0.003))
 
-    def native_worker(idx: int) -> None:
+    def native_worker(idx: int, events: List[str]) -> None:
         for i in range(15):
             payload = f"[native {idx}] chunk {i}\n"
-            with native_lock:
-                native_events.append(payload)
+            events.append(payload)
             os.write(write_fd, payload.encode("utf-8"))
             time.sleep(random.uniform(0.0, 0.004))
 
@@ -260,7 +319,11 @@ def run_trial(trial_id: int, *, validate: bool = True) -> dict:
         t.start()
 
     for idx in range(2):
-        t = threading.Thread(target=native_worker, args=(idx,), name=f"native-{idx}")
+        t = threading.Thread(
+            target=native_worker,
+            args=(idx, native_events_per_thread[idx]),
+            name=f"native-{idx}",
+        )
         native_threads.append(t)
         t.start()
 
@@ -275,6 +338,8 @@ def run_trial(trial_id: int, *, validate: bool = True) -> dict:
     os.close(read_fd)
     mirror.join(timeout=0.1)
 
+    proxy_events = proxy_stdout.events
+    native_events = [payload for events in native_events_per_thread for payload in events]
     native_payload = "".join(native_events)
     mirror_payload = "".join(event["payload"] for event in mirror_events)
 
@@ -298,7 +363,14 @@ def run_trial(trial_id: int, *, validate: bool = True) -> dict:
         result["proxy_events_detail"] = proxy_events
         return result
 
-    if native_payload != mirror_payload:
+    # Native threads write concurrently, so only each thread's own order is
+    # fixed. Every payload is one line written with a single (atomic) write.
+    mirror_lines = mirror_payload.splitlines(keepends=True)
+    mismatched = len(mirror_lines) != len(native_events) or any(
+        [line for line in mirror_lines if line.startswith(f"[native {idx}]")] != events
+        for idx, events in enumerate(native_events_per_thread)
+    )
+    if mismatched:
         raise AssertionError(
             "mirror payload does not match native writes",
             native_payload[:200],
@@ -313,9 +385,9 @@ def run_trial(trial_id: int, *, validate: bool = True) -> dict:
 
     # Ensure proxy payloads never leak through the mirror events.
     for event in proxy_events:
-        text = event["text"]
-        if "[proxy" in text and text in mirror_payload:
-            raise AssertionError("proxy payload leaked into mirror capture", event["text"])
+        for line in event["text"].splitlines():
+            if "[proxy" in line and line in mirror_payload:
+                raise AssertionError("proxy payload leaked into mirror capture", line)
 
     return result
 
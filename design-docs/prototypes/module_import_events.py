@@ -16,6 +16,8 @@ Usage examples:
 
 Pass ``--include-lines`` to log `LINE` events as well, and ``--show-all`` to dump
 events for every file that executed during the import (not just the target).
+Use ``--events py_start,py_return,py_unwind`` to enable only the start/finish
+events you need; unselected events are never enabled in the interpreter.
 """
 
 from __future__ import annotations
@@ -25,7 +27,10 @@ import contextlib
 import importlib
 import importlib.util
 import itertools
+import os
+import reprlib
 import sys
+from array import array
 from dataclasses import dataclass
 from pathlib import Path
 from types import CodeType, ModuleType
@@ -34,6 +39,30 @@ from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 _MODULE_ALIAS_COUNTER = itertools.count()
 
+# Start/finish events that ``--events`` can select; each maps to the
+# ``sys.monitoring.events`` member of the same name in upper case and to the
+# ``MonitoringProbe.on_<name>`` callback.
+START_FINISH_EVENTS = (
+    "py_start",
+    "py_return",
+    "py_unwind",
+    "py_yield",
+    "py_resume",
+    "py_throw",
+)
+
+
+def parse_event_names(value: str) -> Tuple[str, ...]:
+    names = tuple(
+        dict.fromkeys(name.strip().lower() for name in value.split(",") if name.strip())
+    )
+    unknown = [name for name in names if name not in START_FINISH_EVENTS]
+    if unknown or not names:
+        raise argparse.ArgumentTypeError(
+            f"expected a comma-separated subset of {', '.join(START_FINISH_EVENTS)}"
+        )
+    return names
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
@@ -56,6 +85,16 @@ def parse_args() -> argparse.Namespace:
             "Defaults to an auto-generated unique name."
         ),
     )
+    parser.add_argument(
+        "--events",
+        type=parse_event_names,
+        default=START_FINISH_EVENTS,
+        help=(
+            "Comma-separated start/finish events to monitor (default: all of "
+            f"{','.join(START_FINISH_EVENTS)}). Events that are not selected are "
+            "never enabled, so the interpreter does not dispatch them at all."
+        ),
+    )
     parser.add_argument(
         "--include-lines",
         action="store_true",
@@ -69,7 +108,7 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class EventRecord:
     index: int
     event: str
@@ -78,83 +117,161 @@ class EventRecord:
     detail: str
 
 
+# Event kinds are stored as small ints; ``_EVENT_NAMES`` maps them back.
+_EVENT_NAMES = (
+    "PY_START",
+    "PY_RETURN",
+    "PY_UNWIND",
+    "PY_YIELD",
+    "PY_RESUME",
+    "PY_THROW",
+    "LINE",
+)
+(
+    _PY_START,
+    _PY_RETURN,
+    _PY_UNWIND,
+    _PY_YIELD,
+    _PY_RESUME,
+    _PY_THROW,
+    _LINE,
+) = range(len(_EVENT_NAMES))
+# Detail line per event kind, filled with the offset (or line) and payload.
+_DETAIL_FORMATS = (
+    "offset={}",
+    "offset={}, retval={}",
+    "offset={}, exception={}",
+    "offset={}, yielded={}",
+    "offset={}",
+    "offset={}, exception={}",
+    "line={}",
+)
+# Payloads of these exact types cannot change after the event, so their
+# ``repr`` is left to report time. Anything else is described as it arrives.
+_DEFERRED_PAYLOAD_TYPES = frozenset({type(None), bool, int, float, str, bytes})
+
+
 class MonitoringProbe:
-    """Capture sys.monitoring callbacks and store them as EventRecord entries."""
+    """Capture sys.monitoring callbacks in parallel columns.
+
+    Callbacks can fire millions of times during a large import, so each one
+    only appends the event kind, code object and raw offset (or line) to
+    columns instead of building an ``EventRecord``. Return values, yielded
+    values and exceptions are described when the event fires, so a payload
+    mutated later still shows its state at that point; immutable scalars are
+    kept as-is and described only if reported. Both dicts are keyed by record
+    index, since only some kinds carry a payload. The record index is the
+    column position; detail strings and ``EventRecord`` objects are built on
+    demand for reporting.
+    """
 
     def __init__(self) -> None:
-        self._records: List[EventRecord] = []
-        self._counter = itertools.count()
-
-    def _add(self, event: str, code: CodeType, detail: str) -> None:
-        self._records.append(
-            EventRecord(
-                index=next(self._counter),
-                event=event,
-                code_name=code.co_name,
-                filename=code.co_filename,
-                detail=detail,
-            )
-        )
-
+        self._events = array("B")
+        self._codes: List[CodeType] = []
+        self._args = array("q")
+        self._payloads: Dict[int, str] = {}
+        self._scalar_payloads: Dict[int, object] = {}
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def _add_with_payload(self, event: int, code: CodeType, offset: int, value: object) -> None:
+        if type(value) in _DEFERRED_PAYLOAD_TYPES:
+            self._scalar_payloads[len(self._events)] = value
+        else:
+            self._payloads[len(self._events)] = describe_value(value)
+        self._events.append(event)
+        self._codes.append(code)
+        self._args.append(offset)
+
+    # PY_START, PY_RESUME and LINE are the hottest callbacks, so they append
+    # to the columns directly rather than going through a helper call.
     def on_py_start(self, code: CodeType, offset: int) -> None:
-        self._add("PY_START", code, f"offset={offset}")
+        self._events.append(_PY_START)
+        self._codes.append(code)
+        self._args.append(offset)
 
     def on_py_return(self, code: CodeType, offset: int, retval: object) -> None:
-        self._add(
-            "PY_RETURN",
-            code,
-            f"offset={offset}, retval={describe_value(retval)}",
-        )
+        self._add_with_payload(_PY_RETURN, code, offset, retval)
 
     def on_py_unwind(self, code: CodeType, offset: int, exc: object) -> None:
-        self._add(
-            "PY_UNWIND",
-            code,
-            f"offset={offset}, exception={describe_value(exc)}",
-        )
+        self._add_with_payload(_PY_UNWIND, code, offset, exc)
 
     def on_py_yield(self, code: CodeType, offset: int, value: object) -> None:
-        self._add(
-            "PY_YIELD",
-            code,
-            f"offset={offset}, yielded={describe_value(value)}",
-        )
+        self._add_with_payload(_PY_YIELD, code, offset, value)
 
     def on_py_resume(self, code: CodeType, offset: int) -> None:
-        self._add("PY_RESUME", code, f"offset={offset}")
+        self._events.append(_PY_RESUME)
+        self._codes.append(code)
+        self._args.append(offset)
 
     def on_py_throw(self, code: CodeType, offset: int, exc: object) -> None:
-        self._add(
-            "PY_THROW",
-            code,
-            f"offset={offset}, exception={describe_value(exc)}",
-        )
+        self._add_with_payload(_PY_THROW, code, offset, exc)
 
     def on_line(self, code: CodeType, line: int) -> None:
-        self._add("LINE", code, f"line={line}")
+        self._events.append(_LINE)
+        self._codes.append(code)
+        self._args.append(line)
+
+    def _record(self, index: int) -> EventRecord:
+        code = self._codes[index]
+        event = self._events[index]
+        payload = self._payloads.get(index)
+        if index in self._scalar_payloads:
+            payload = describe_value(self._scalar_payloads[index])
+        return EventRecord(
+            index=index,
+            event=_EVENT_NAMES[event],
+            code_name=code.co_name,
+            filename=code.co_filename,
+            detail=_DETAIL_FORMATS[event].format(self._args[index], payload),
+        )
 
     @property
     def records(self) -> List[EventRecord]:
-        return list(self._records)
+        return [self._record(index) for index in range(len(self._events))]
 
     def records_for(self, focus: Optional[Path]) -> List[EventRecord]:
         if focus is None:
-            return list(self._records)
+            return self.records
         focus_norm = normalize_path(focus)
+        # ``normalize_path`` resolves the path on disk, so decide each distinct
+        # filename once instead of once per event.
+        is_focus: Dict[str, bool] = {}
         matches: List[EventRecord] = []
-        for record in self._records:
-            filename = record.filename
-            if filename.startswith("<") and filename.endswith(">"):
-                continue
-            if normalize_path(filename) == focus_norm:
-                matches.append(record)
+        for index, code in enumerate(self._codes):
+            filename = code.co_filename
+            hit = is_focus.get(filename)
+            if hit is None:
+                hit = is_focus[filename] = not (
+                    filename.startswith("<") and filename.endswith(">")
+                ) and normalize_path(filename) == focus_norm
+            if hit:
+                matches.append(self._record(index))
         return matches
 
 
+# Bounds the work done inside ``repr`` itself: containers stop after a few
+# items and nesting levels instead of being rendered in full and trimmed.
+_VALUE_REPR = reprlib.Repr(
+    maxlevel=3,
+    maxtuple=6,
+    maxlist=6,
+    maxarray=6,
+    maxdict=4,
+    maxset=6,
+    maxfrozenset=6,
+    maxdeque=6,
+    maxstring=80,
+    maxlong=80,
+    maxother=80,
+)
+
+
 def describe_value(value: object, limit: int = 80) -> str:
     """Return a safe, trimmed repr for value payloads recorded in callbacks."""
     try:
-        text = repr(value)
+        text = _VALUE_REPR.repr(value)
     except Exception as exc:  # pragma: no cover - prototyping aid
         text = f"<repr failed: {exc!r}>"
     if len(text) > limit:
@@ -163,10 +280,11 @@ def describe_value(value: object, limit: int = 80) -> str:
 
 
 def normalize_path(value: Path | str) -> str:
-    raw = str(value)
+    raw = os.fspath(value)
     if raw.startswith("<") and raw.endswith(">"):
         return raw
-    return str(Path(raw).resolve())
+    # Same result as ``str(Path(raw).resolve())`` without the Path round-trips.
+    return os.path.realpath(raw)
 
 
 def acquire_tool_id(name: str) -> Tuple[int, object]:
@@ -182,16 +300,15 @@ def acquire_tool_id(name: str) -> Tuple[int, object]:
 
 
 @contextlib.contextmanager
-def monitor_events(probe: MonitoringProbe, include_lines: bool) -> Iterator[None]:
+def monitor_events(
+    probe: MonitoringProbe,
+    include_lines: bool,
+    event_names: Iterable[str] = START_FINISH_EVENTS,
+) -> Iterator[None]:
     tool_id, monitoring = acquire_tool_id("module-import-events")
     events = monitoring.events
     callbacks: Dict[int, object] = {
-        events.PY_START: probe.on_py_start,
-        events.PY_RETURN: probe.on_py_return,
-        events.PY_UNWIND: probe.on_py_unwind,
-        events.PY_YIELD: probe.on_py_yield,
-        events.PY_RESUME: probe.on_py_resume,
-        events.PY_THROW: probe.on_py_throw,
+        getattr(events, name.upper()): getattr(probe, f"on_{name}") for name in event_names
     }
     if include_lines:
         callbacks[events.LINE] = probe.on_line
@@ -213,7 +330,11 @@ def monitor_events(probe: MonitoringProbe, include_lines: bool) -> Iterator[None
 
 def import_target(args: argparse.Namespace) -> Tuple[ModuleType, Optional[Path]]:
     if args.module:
-        module = importlib.import_module(args.module)
+        # An already-imported module runs no import code, so skip the dotted
+        # name handling and import lock in ``import_module`` altogether.
+        module = sys.modules.get(args.module)
+        if module is None:
+            module = importlib.import_module(args.module)
         file_attr = getattr(module, "__file__", None)
         module_path = Path(file_attr).resolve() if file_attr else None
         return module, module_path
@@ -231,18 +352,24 @@ def import_target(args: argparse.Namespace) -> Tuple[ModuleType, Optional[Path]]
 
 
 def print_report(
-    probe: MonitoringProbe, focus: Optional[Path], show_all: bool, include_lines: bool
+    probe: MonitoringProbe,
+    focus: Optional[Path],
+    show_all: bool,
+    include_lines: bool,
+    event_names: Iterable[str] = START_FINISH_EVENTS,
 ) -> None:
-    total = len(probe.records)
+    total = len(probe)
     section = "=" * 72
     print(f"\n{section}")
     print("Module import monitoring session")
     print(f"Recorded events: {total}")
+    print(f"Monitored events: {', '.join(name.upper() for name in event_names)}")
     print(f"Line events included: {include_lines}")
     if focus:
         print(f"Target path: {focus}")
     print(section)
 
+    # Without a focus path this is already every record.
     focus_records = probe.records_for(focus)
     title = (
         "Events for target module"
@@ -250,7 +377,7 @@ def print_report(
         else "Events captured during import"
     )
     print(f"\n{title}:")
-    _print_records(focus_records if focus else probe.records)
+    _print_records(focus_records)
 
     if focus and show_all:
         print("\nAll recorded events (including other modules):")
@@ -264,18 +391,22 @@ def print_report(
 
 
 def _print_records(records: Iterable[EventRecord]) -> None:
-    records = list(records)
-    if not records:
-        print("  (no events)")
-        return
+    lines: List[str] = []
     for record in records:
         path_display = record.filename
         if len(path_display) > 60:
             path_display = "..." + path_display[-57:]
-        print(
+        lines.append(
             f"  #{record.index:03d} {record.event:<10} "
-            f"{record.code_name:<20} {record.detail} [{path_display}]"
+            f"{record.code_name:<20} {record.detail} [{path_display}]\n"
         )
+    if not lines:
+        print("  (no events)")
+        return
+    # One write for the whole listing: ``--show-all`` dumps can run to
+    # millions of lines, and a line-buffered terminal would otherwise see
+    # a separate write per record.
+    sys.stdout.write("".join(lines))
 
 
 def main() -> None:
@@ -284,7 +415,7 @@ def main() -> None:
     focus_path: Optional[Path] = args.module_path.resolve() if args.module_path else None
     import_error: Optional[BaseException] = None
 
-    with monitor_events(probe, include_lines=args.include_lines):
+    with monitor_events(probe, include_lines=args.include_lines, event_names=args.events):
         try:
             _, loaded_path = import_target(args)
             if loaded_path is not None:
@@ -292,7 +423,7 @@ def main() -> None:
         except BaseException as exc:  # keep prototype noise visible
             import_error = exc
 
-    print_report(probe, focus_path, args.show_all, args.include_lines)
+    print_report(probe, focus_path, args.show_all, args.include_lines, args.events)
 
     if import_error:
         raise import_error